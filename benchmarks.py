@@ -0,0 +1,233 @@
+"""
+Benchmark suite: feedback and pruning micro-benchmarks, per-turn guess
+latency for both guessers at several solution-set sizes, a sweep of N
+openers × every target, and the import-time budget for the solver modules.
+
+Everything is seeded and runs on the shipped word lists, so two runs on the
+same machine are comparable. Results are printed (or written) as JSON;
+--compare fails with exit status 1 when any timing got slower than the
+baseline by more than --tolerance, or when imports exceed IMPORT_BUDGET_S.
+
+    python benchmarks.py --out base.json
+    … change something …
+    python benchmarks.py --compare base.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import guesser
+import guesser_entropy
+import word_lists
+import wordle_heavy_computation as heavy
+from feedback import (PATTERN_COLORS, colors_to_code, feedback_codes, load_feedback_matrix,
+                      pattern_code, word_list_hash)
+from game_state import GameState
+from pruning import (default_word_index, infoPrune, infoPruneIndices, patternPruneIndices,
+                     wordlePrune, wordlePruneIndices)
+from wordle import wordle_feedback_for_guess
+
+SEED            = 1234
+IMPORT_BUDGET_S = 0.5           # importing every solver module, numpy included
+SOLVER_MODULES  = ("wordle", "guesser", "guesser_entropy", "wordle_heavy_computation")
+SIZE_BUCKETS    = ((6, 50), (51, 500), (501, 20000))   # solution-set sizes for guess latency
+
+
+def _best(fn, number=1, repeat=5):
+    """Best wall time of one call to fn, over `repeat` runs of `number` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _samples(rng, words, n):
+    """n fixed (guess, colors) pairs: a random guess against a random answer."""
+    answers = word_lists.targets()
+    pairs = []
+    for _ in range(n):
+        guess = rng.choice(words)
+        pairs.append((guess, PATTERN_COLORS[pattern_code(guess, rng.choice(answers))]))
+    return pairs
+
+
+# ---------- micro-benchmarks ---------------------------------------------
+def bench_feedback(rng, repeat):
+    words   = list(word_lists.all_words())
+    answers = list(word_lists.targets())
+    pairs   = [(rng.choice(words), rng.choice(answers)) for _ in range(2000)]
+    return {
+        "feedback.wordle_feedback_for_guess": _best(lambda: [wordle_feedback_for_guess(g, s) for g, s in pairs],
+                                                    repeat=repeat) / len(pairs),
+        "feedback.pattern_code": _best(lambda: [pattern_code(g, s) for g, s in pairs], repeat=repeat) / len(pairs),
+        "feedback.feedback_codes_row": _best(lambda: feedback_codes(pairs[0][0], answers), repeat=repeat),
+    }
+
+
+def bench_pruning(rng, repeat):
+    words = list(word_lists.all_words())
+    index = default_word_index()
+    pairs = _samples(rng, words, 20)
+
+    def per_pair(fn):
+        return _best(lambda: [fn(g, c) for g, c in pairs], repeat=repeat) / len(pairs)
+
+    results = {
+        "pruning.wordlePrune": per_pair(lambda g, c: wordlePrune(g, words, c)),
+        "pruning.infoPrune": per_pair(lambda g, c: infoPrune(g, words, c)),
+        "pruning.wordlePruneIndices": per_pair(lambda g, c: wordlePruneIndices(g, None, c, index)),
+        "pruning.infoPruneIndices": per_pair(lambda g, c: infoPruneIndices(g, None, c, index)),
+    }
+    matrix = load_feedback_matrix(words, words)
+    ids    = word_lists.word_ids()
+    every  = index.all()
+    results["pruning.patternPruneIndices"] = per_pair(
+        lambda g, c: patternPruneIndices(ids[g], every, colors_to_code(c), matrix))
+    return results
+
+
+# ---------- per-turn guess latency -------------------------------------------
+def _turn2_states(rng, per_bucket):
+    """Fixed turn-2 states (solutions, information) bucketed by solution-set size."""
+    index   = default_word_index()
+    words   = index.words
+    states  = {b: [] for b in SIZE_BUCKETS}
+    for _ in range(20000):
+        if all(len(v) >= per_bucket for v in states.values()):
+            break
+        guess, colors = _samples(rng, words, 1)[0]
+        sols = wordlePruneIndices(guess, None, colors, index)
+        for lo, hi in SIZE_BUCKETS:
+            if lo <= len(sols) <= hi and len(states[lo, hi]) < per_bucket:
+                states[lo, hi].append((sols, infoPruneIndices(guess, None, colors, index), guess, colors))
+    return states
+
+
+def bench_guess_latency(rng, repeat, per_bucket=3):
+    heuristic = guesser.Guesser()
+    entropy   = guesser_entropy.Guesser(cache_bytes=0)     # time the search, not the cache
+    results   = {}
+    for (lo, hi), states in _turn2_states(rng, per_bucket).items():
+        if not states:
+            continue
+        prepared = []
+        for sols, info, guess, colors in states:
+            state = GameState()
+            state.apply(guess, colors)
+            prepared.append((sols, info, state))
+        results[f"guess.heuristic.sols_{lo}_{hi}"] = _best(
+            lambda: [heuristic.choices(2, s, i, st) for s, i, st in prepared], repeat=repeat) / len(prepared)
+        results[f"guess.entropy.sols_{lo}_{hi}"] = _best(
+            lambda: [entropy._search(2, s, i) for s, i, _ in prepared], repeat=min(repeat, 3)) / len(prepared)
+    return results
+
+
+# ---------- macro-benchmark ------------------------------------------------
+def bench_sweep(rng, n_openers, solver="normal"):
+    """Seconds per opener for simulate_batch over every target."""
+    heavy.load_word_lists()
+    openers = rng.sample(heavy.STARTING_WORDS, n_openers)
+    start = time.perf_counter()
+    for opener in openers:
+        heavy.simulate_batch(opener, heavy.TARGETS, solver, SEED)
+    per_opener = (time.perf_counter() - start) / n_openers
+    return {f"sweep.{solver}.per_opener": per_opener,
+            f"sweep.{solver}.per_game": per_opener / heavy.T}
+
+
+# ---------- import time ---------------------------------------------------
+def bench_import(repeat):
+    """Best fresh-interpreter time to import every solver module."""
+    code = ("import time; t = time.perf_counter(); "
+            + "; ".join(f"import {m}" for m in SOLVER_MODULES)
+            + "; print(time.perf_counter() - t)")
+    here  = os.path.dirname(os.path.abspath(__file__))
+    times = [float(subprocess.run([sys.executable, "-c", code], check=True, cwd=here,
+                                  capture_output=True, text=True).stdout)
+             for _ in range(repeat)]
+    return {"import.solver_modules": min(times)}
+
+
+# ---------------------------------------------------------------------------
+def run(openers=3, repeat=5, quick=False):
+    rng = random.Random(SEED)
+    if quick:
+        openers, repeat = 1, 2
+    results = {}
+    results.update(bench_import(repeat))
+    results.update(bench_feedback(rng, repeat))
+    results.update(bench_pruning(rng, repeat))
+    results.update(bench_guess_latency(rng, repeat, 1 if quick else 3))
+    results.update(bench_sweep(rng, openers))
+    return {
+        "meta": {
+            "seed": SEED,
+            "openers": openers,
+            "repeat": repeat,
+            "word_list_hash": word_list_hash(word_lists.all_words(), word_lists.targets()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "seconds": results,
+    }
+
+
+def regressions(current, baseline=None, tolerance=0.25):
+    """
+    Lines describing every regression (empty when there is none): imports
+    over IMPORT_BUDGET_S and, given a baseline, timings more than
+    `tolerance` slower than it.
+    """
+    failures = []
+    took = current["seconds"].get("import.solver_modules")
+    if took is not None and took > IMPORT_BUDGET_S:
+        failures.append(f"import.solver_modules: {took:.3f}s over the {IMPORT_BUDGET_S}s budget")
+    if baseline is None:
+        return failures
+    if baseline["meta"].get("word_list_hash") != current["meta"]["word_list_hash"]:
+        failures.append("word lists differ from the baseline's; timings are not comparable")
+        return failures
+    for name, old in baseline["seconds"].items():
+        new = current["seconds"].get(name)
+        if new is not None and old > 0 and new > old * (1 + tolerance):
+            failures.append(f"{name}: {old:.3g}s -> {new:.3g}s ({new / old:.2f}x)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier run to check against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--openers", type=int, default=3, help="openers in the sweep benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="one opener, two repeats")
+    args = parser.parse_args(argv)
+
+    report = run(args.openers, args.repeat, args.quick)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    failures = regressions(report, baseline, args.tolerance)
+    for line in failures:
+        print("REGRESSION", line, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Small memory-bounded LRU cache used by the solvers, plus a stable
+fingerprint for candidate sets so cached results are tied to the exact
+set of words they were computed on (not just its size).
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+
+def fingerprint(indices):
+    """Order-independent 128-bit digest of a set of word indices."""
+    idx = np.sort(np.asarray(indices, dtype=np.int32))
+    return hashlib.blake2b(idx.tobytes(), digest_size=16).digest()
+
+
+def _entry_size(key, value):
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(k) for k in key)
+    return size
+
+
+class LRUCache:
+    """
+    Least-recently-used mapping capped at roughly max_bytes (keys and
+    values measured with sys.getsizeof). Tracks hits, misses and evictions.
+    """
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes    = 0
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._data     = OrderedDict()   # key -> (value, size)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        size = _entry_size(key, value)
+        self._data[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes and self._data:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._data),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
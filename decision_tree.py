@@ -0,0 +1,239 @@
+"""
+Full decision-tree solver.
+
+For a fixed opener, build the whole strategy over the answer list: every
+node holds a guess and one child per feedback pattern, so playing a game is
+a pointer walk and the exact guess distribution of the opener falls out of
+the tree without simulating any games.
+
+The search is depth-limited (6 guesses) and, at every node, only expands
+the `top_k` most promising guesses by expected bucket size. Candidates are
+skipped once their lower bound cannot beat the best total found so far,
+using the fact that n answers need at least 2n - 1 guesses in total (one
+can be hit straight away, every other needs two or more).
+
+Trees are stored as flat arrays in a .npz file:
+    node_guess[node]                      guess (index into `guesses`)
+    child_start[node], child_count[node]  slice of the child arrays
+    child_pattern[i], child_node[i]       pattern code -> child node
+"""
+import os
+
+import numpy as np
+
+from cache import fingerprint
+from feedback import ALL_GREEN, CACHE_DIR, default_word_lists, load_feedback_matrix, pattern_code, word_list_hash
+from pruning import patternHistograms, patternPartition
+
+MAX_GUESSES = 6
+LOSS_COST   = 1000          # per answer left unsolved after MAX_GUESSES; keeps losses a last resort
+TREE_VERSION = 1
+
+
+def _lower_bound(n):
+    return 2 * n - 1 if n else 0
+
+
+class _Search:
+    def __init__(self, guesses, answers, matrix, top_k):
+        self.guesses = guesses
+        self.matrix  = matrix
+        self.top_k   = top_k
+        self.rows    = np.arange(len(guesses))
+        # answers[c] is guesses[answer_row[c]]
+        index = {w: i for i, w in enumerate(guesses)}
+        self.answer_row = np.array([index.get(w, -1) for w in answers])
+        if (self.answer_row < 0).any():
+            raise ValueError("every answer must also be an allowed guess")
+        self.memo = {}
+
+    def candidates(self, S):
+        """The top_k guesses by expected bucket size; guesses in S win ties."""
+        hist   = patternHistograms(self.rows, S, self.matrix).astype(np.int64)
+        score  = (hist ** 2).sum(axis=1) * 2
+        in_set = np.zeros(len(self.guesses), dtype=bool)
+        in_set[self.answer_row[S]] = True
+        score -= in_set
+        useless = (hist.max(axis=1) == len(S)) & ~in_set     # learns nothing
+        score[useless] = np.iinfo(np.int64).max
+        k = min(self.top_k, len(score))
+        best = np.argpartition(score, k - 1)[:k]
+        return best[np.argsort(score[best], kind="stable")]
+
+    def solve(self, S, depth, bound=float("inf")):
+        """
+        (total guesses over every answer in S, node) for the best subtree
+        found, where depth is the turn the node's guess is made on. Returns
+        cost >= bound (and node None) when nothing beats `bound`.
+        """
+        n = len(S)
+        if n == 1:
+            return 1, (int(self.answer_row[S[0]]), {})
+        if depth == MAX_GUESSES:
+            return 1 + (n - 1) * LOSS_COST, (int(self.answer_row[S[0]]), {})
+        if _lower_bound(n) >= bound:
+            return bound, None
+
+        # an answer that splits the rest into singletons meets the lower bound
+        for r in self.answer_row[S]:
+            codes = self.matrix[r, S]
+            if len(np.unique(codes)) == n:
+                return _lower_bound(n), (int(r), {int(p): (int(self.answer_row[a]), {})
+                                                  for p, a in zip(codes, S) if p != ALL_GREEN})
+
+        key = (fingerprint(S), depth)
+        memo = self.memo.get(key)
+        if memo is not None:
+            return memo
+
+        best_cost, best_node = bound, None
+        for g in self.candidates(S):
+            buckets = patternPartition(g, S, self.matrix)
+            live    = [(p, b) for p, b in enumerate(buckets) if len(b) and p != ALL_GREEN]
+
+            # this guess is made for every answer in S; solved ones stop here
+            cost   = n
+            remain = sum(_lower_bound(len(b)) for _, b in live)
+            if cost + remain >= best_cost:
+                continue
+            children = {}
+            for p, b in sorted(live, key=lambda pb: -len(pb[1])):
+                remain -= _lower_bound(len(b))
+                sub_cost, sub_node = self.solve(b, depth + 1, best_cost - cost - remain)
+                cost += sub_cost
+                if sub_node is None or cost + remain >= best_cost:
+                    break
+                children[p] = sub_node
+            else:
+                best_cost, best_node = cost, (int(g), children)
+
+        if best_node is not None or bound == float("inf"):
+            self.memo[key] = (best_cost, best_node)
+        return best_cost, best_node
+
+
+class StrategyTree:
+    def __init__(self, guesses, node_guess, child_start, child_count, child_pattern, child_node):
+        self.guesses       = list(guesses)
+        self.node_guess    = node_guess
+        self.child_start   = child_start
+        self.child_count   = child_count
+        self.child_pattern = child_pattern
+        self.child_node    = child_node
+
+    def __len__(self):
+        return len(self.node_guess)
+
+    @property
+    def opener(self):
+        return self.guesses[self.node_guess[0]]
+
+    def guess(self, node):
+        return self.guesses[self.node_guess[node]]
+
+    def next_node(self, node, pattern):
+        """Child of `node` for feedback `pattern` (a code), or -1 if the tree has none."""
+        start = self.child_start[node]
+        stop  = start + self.child_count[node]
+        i = start + np.searchsorted(self.child_pattern[start:stop], pattern)
+        if i < stop and self.child_pattern[i] == pattern:
+            return int(self.child_node[i])
+        return -1
+
+    def play(self, secret):
+        """Guesses the tree makes against `secret`; ends on the secret unless lost."""
+        played, node = [], 0
+        while node != -1 and len(played) < MAX_GUESSES:
+            guess = self.guess(node)
+            played.append(guess)
+            code = pattern_code(guess, secret)
+            if code == ALL_GREEN:
+                break
+            node = self.next_node(node, code)
+        return played
+
+    def distribution(self, answers):
+        """counts[7] like wordle_heavy_computation.worker: bins 1…6 guesses, then lost."""
+        counts = np.zeros(7, dtype=np.int32)
+        for secret in answers:
+            played = self.play(secret)
+            counts[len(played) - 1 if played[-1] == secret else 6] += 1
+        return counts
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_nested(cls, guesses, root):
+        """Flatten (guess_row, {pattern: child}) nodes in breadth-first order."""
+        node_guess, child_start, child_count, child_pattern, child_node = [], [], [], [], []
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            g, children = queue[head]
+            head += 1
+            node_guess.append(g)
+            child_start.append(len(child_pattern))
+            child_count.append(len(children))
+            for p in sorted(children):
+                child_pattern.append(p)
+                child_node.append(len(queue))
+                queue.append(children[p])
+        return cls(guesses,
+                   np.array(node_guess, dtype=np.int32),
+                   np.array(child_start, dtype=np.int32),
+                   np.array(child_count, dtype=np.uint8),
+                   np.array(child_pattern, dtype=np.uint8),
+                   np.array(child_node, dtype=np.int32))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, version=TREE_VERSION, guesses=np.array(self.guesses),
+                            node_guess=self.node_guess, child_start=self.child_start,
+                            child_count=self.child_count, child_pattern=self.child_pattern,
+                            child_node=self.child_node)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data["version"]) != TREE_VERSION:
+                raise ValueError(f"{path}: strategy tree version {int(data['version'])}, expected {TREE_VERSION}")
+            return cls(data["guesses"].tolist(), data["node_guess"], data["child_start"],
+                       data["child_count"], data["child_pattern"], data["child_node"])
+
+
+def build_tree(opener, guesses=None, answers=None, top_k=5):
+    """
+    Strategy tree for `opener` over `answers` (default: the targets), with
+    later guesses drawn from `guesses` (default: every word).
+    """
+    default_guesses, default_answers = default_word_lists()
+    guesses = list(guesses) if guesses is not None else default_guesses
+    answers = list(answers) if answers is not None else default_answers
+    search  = _Search(guesses, answers, load_feedback_matrix(guesses, answers), top_k)
+
+    g = guesses.index(opener)
+    S = np.arange(len(answers))
+    codes   = search.matrix[g, S]
+    children = {}
+    for p in np.unique(codes):
+        if p != ALL_GREEN:
+            children[int(p)] = search.solve(S[codes == p], 2)[1]
+    return StrategyTree.from_nested(guesses, (g, children))
+
+
+def tree_path(opener, guesses, answers, top_k):
+    return os.path.join(CACHE_DIR, f"tree_v{TREE_VERSION}_{opener}_k{top_k}_{word_list_hash(guesses, answers)}.npz")
+
+
+def load_or_build_tree(opener, guesses=None, answers=None, top_k=5):
+    """Strategy tree for opener, built and saved under .cache/ on first use."""
+    default_guesses, default_answers = default_word_lists()
+    guesses = list(guesses) if guesses is not None else default_guesses
+    answers = list(answers) if answers is not None else default_answers
+    path = tree_path(opener, guesses, answers, top_k)
+    if os.path.exists(path):
+        return StrategyTree.load(path)
+    tree = build_tree(opener, guesses, answers, top_k)
+    tree.save(path)
+    return tree
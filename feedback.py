@@ -0,0 +1,158 @@
+"""
+Feedback patterns as base-3 integers plus the precomputed guess x answer
+feedback matrix.
+
+A pattern is read left to right as a base-3 number with B=0, Y=1, G=2, so
+"BBBBB" is 0 and "GGGGG" is 242 and every pattern fits in a uint8.
+
+The matrix is built once per (guess list, answer list) pair, saved under
+.cache/ with a name keyed on a hash of both lists, and memory-mapped on
+load so every process in a pool shares one page-cached copy.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from word_lists import CACHE_DIR, all_words, encode_words, targets
+
+N_PATTERNS     = 243
+ALL_GREEN      = 242                 # "GGGGG"
+MATRIX_VERSION = 1                   # bump when the on-disk layout changes
+
+_DIGIT = {"B": 0, "Y": 1, "G": 2}
+
+
+def colors_to_code(guess_colors):
+    """"GGBYB" -> base-3 pattern code."""
+    code = 0
+    for c in guess_colors:
+        code = code * 3 + _DIGIT[c]
+    return code
+
+
+def code_to_colors(code):
+    """Base-3 pattern code -> "GGBYB"-style string."""
+    out = []
+    for _ in range(5):
+        code, d = divmod(code, 3)
+        out.append("BYG"[d])
+    return "".join(reversed(out))
+
+
+# code -> colour string, used wherever wordlePrune still wants a string
+PATTERN_COLORS = [code_to_colors(c) for c in range(N_PATTERNS)]
+
+
+def pattern_code(guess, solution):
+    """
+    Pattern code for one guess, identical to the colours returned by
+    wordle_feedback_for_guess (greens first, then yellows left to right
+    while unmatched copies of the letter remain in the solution).
+    """
+    digits = [0] * 5
+    remaining = {}
+    for i in range(5):
+        if guess[i] == solution[i]:
+            digits[i] = 2
+        else:
+            remaining[solution[i]] = remaining.get(solution[i], 0) + 1
+    code = 0
+    for i in range(5):
+        d = digits[i]
+        if d == 0 and remaining.get(guess[i], 0) > 0:
+            d = 1
+            remaining[guess[i]] -= 1
+        code = code * 3 + d
+    return code
+
+
+# ---------- Feedback matrix ------------------------------------------------
+def default_word_lists():
+    """(guesses, answers) the matrix covers by default: every word x every target."""
+    return list(all_words()), list(targets())
+
+
+def word_list_hash(guesses, answers):
+    h = hashlib.sha1(f"v{MATRIX_VERSION}".encode())
+    for words in (guesses, answers):
+        h.update(b"\0")
+        h.update("\n".join(words).encode())
+    return h.hexdigest()[:16]
+
+
+def matrix_path(guesses, answers):
+    return os.path.join(CACHE_DIR, f"feedback_v{MATRIX_VERSION}_{word_list_hash(guesses, answers)}.npy")
+
+
+def feedback_codes(guesses, answers):
+    """
+    Batch feedback kernel: pattern codes of one guess or a block of guesses
+    against many answers at once.
+
+    guesses : str, list[str], or a (5,) / (m, 5) array from encode_words
+    answers : list[str] or an (n, 5) array from encode_words
+
+    Returns a (n,) uint8 array for a single guess, (m, n) for a block.
+    Duplicate letters follow wordle_feedback_for_guess exactly: greens are
+    taken first, then each remaining guess letter turns yellow, left to
+    right, while unmatched copies of it are left in the answer.
+    """
+    single = isinstance(guesses, str) or (isinstance(guesses, np.ndarray) and guesses.ndim == 1)
+    if isinstance(guesses, str):
+        guesses = [guesses]
+    g = np.atleast_2d(guesses if isinstance(guesses, np.ndarray) else encode_words(guesses))
+    a = answers if isinstance(answers, np.ndarray) else encode_words(answers)
+
+    green   = g[:, None, :] == a[None, :, :]                 # (m, n, 5)
+    shape   = green.shape[:2]
+    code    = np.zeros(shape, dtype=np.uint8)
+    yellows = []
+    for i in range(5):
+        gi = g[:, i, None]                                   # (m, 1)
+        # copies of g[i] sitting in non-green answer positions …
+        avail = np.zeros(shape, dtype=np.int8)
+        for j in range(5):
+            avail += (a[None, :, j] == gi) & ~green[:, :, j]
+        # … minus the ones already claimed by earlier yellows of that letter
+        for k in range(i):
+            avail -= yellows[k] & (g[:, k, None] == gi)
+        yellow = ~green[:, :, i] & (avail > 0)
+        yellows.append(yellow)
+        code = code * 3 + green[:, :, i] * np.uint8(2) + yellow
+    return code[0] if single else code
+
+
+def build_feedback_matrix(guesses, answers, block=256):
+    """Dense (len(guesses), len(answers)) uint8 matrix of pattern codes."""
+    guess_letters  = encode_words(guesses)
+    answer_letters = encode_words(answers)
+    matrix = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+    for r in range(0, len(guesses), block):
+        matrix[r:r + block] = feedback_codes(guess_letters[r:r + block], answer_letters)
+    return matrix
+
+
+def load_feedback_matrix(guesses=None, answers=None, mmap_mode="r"):
+    """
+    Memory-mapped feedback matrix for (guesses, answers), building and
+    saving it first if no cached copy exists for these exact word lists.
+
+    Row r / column c is the pattern code of guesses[r] against answers[c].
+    """
+    if guesses is None or answers is None:
+        default_guesses, default_answers = default_word_lists()
+        guesses = default_guesses if guesses is None else guesses
+        answers = default_answers if answers is None else answers
+
+    path = matrix_path(guesses, answers)
+    if not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        matrix = build_feedback_matrix(guesses, answers)
+        # write to a private temp file then rename, so concurrent builders
+        # never see a half-written matrix
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,131 @@
+"""
+Compact per-game knowledge, replacing the letter_status dict-of-dicts in
+hot paths.
+
+Everything is a handful of small ints and two 26-entry lists:
+    green[pos]         letter fixed at pos (0-25) or -1
+    banned[pos]        26-bit mask of letters known NOT to be at pos
+    min_count[L]       at least this many L in the answer
+    max_count[L]       at most this many L (5 = unknown)
+    seen               mask of letters guessed so far (any colour)
+    ever_green         mask of letters that have been green somewhere
+    ever_yellow        mask of letters that have been yellow somewhere
+    history            [(guess, colors), …]
+
+apply() pushes an undo record, so search code can try a hypothetical
+guess and undo() it instead of deep-copying the state; copy() is a few
+list copies.
+"""
+
+_A = ord("A")
+
+
+def _bit(ch):
+    return 1 << (ord(ch) - _A)
+
+
+def _letters(mask):
+    return {chr(_A + i) for i in range(26) if mask >> i & 1}
+
+
+class GameState:
+    __slots__ = ("green", "banned", "min_count", "max_count",
+                 "seen", "ever_green", "ever_yellow", "history", "_undo")
+
+    def __init__(self):
+        self.green       = [-1] * 5
+        self.banned      = [0] * 5
+        self.min_count   = [0] * 26
+        self.max_count   = [5] * 26
+        self.seen        = 0
+        self.ever_green  = 0
+        self.ever_yellow = 0
+        self.history     = []
+        self._undo       = []
+
+    def _snapshot(self):
+        return (self.green[:], self.banned[:], self.min_count[:], self.max_count[:],
+                self.seen, self.ever_green, self.ever_yellow)
+
+    def copy(self):
+        new = GameState.__new__(GameState)
+        (new.green, new.banned, new.min_count, new.max_count,
+         new.seen, new.ever_green, new.ever_yellow) = self._snapshot()
+        new.history = self.history[:]
+        new._undo   = []
+        return new
+
+    # ------------------------------------------------------------------
+    def apply(self, guess, guess_colors):
+        """Record one guess and its "GYB" feedback."""
+        self._undo.append(self._snapshot())
+        self.history.append((guess, guess_colors))
+
+        hits = {}                                   # letter -> G+Y count this guess
+        grey = set()
+        for i, (ch, c) in enumerate(zip(guess, guess_colors)):
+            L = ord(ch) - _A
+            self.seen |= 1 << L
+            if c == "G":
+                self.green[i] = L
+                self.ever_green |= 1 << L
+                hits[L] = hits.get(L, 0) + 1
+            else:
+                self.banned[i] |= 1 << L
+                if c == "Y":
+                    self.ever_yellow |= 1 << L
+                    hits[L] = hits.get(L, 0) + 1
+                else:
+                    grey.add(L)
+        for L, n in hits.items():
+            if n > self.min_count[L]:
+                self.min_count[L] = n
+        for L in grey:                              # a grey caps the count exactly
+            self.max_count[L] = min(self.max_count[L], hits.get(L, 0))
+
+    def undo(self):
+        """Roll back the most recent apply()."""
+        (self.green, self.banned, self.min_count, self.max_count,
+         self.seen, self.ever_green, self.ever_yellow) = self._undo.pop()
+        self.history.pop()
+
+    # ------------------------------------------------------------------
+    def guessed_letters(self):
+        """Letters whose letter_status state would not be "not_guessed"."""
+        return _letters(self.seen)
+
+    def yellow_letters(self):
+        """Letters whose letter_status state would be "in_wrong_place"."""
+        return _letters(self.ever_yellow & ~self.ever_green)
+
+    def consistent(self, word):
+        """True when `word` agrees with every green, ban and letter count so far."""
+        counts = [0] * 26
+        for i, ch in enumerate(word):
+            L = ord(ch) - _A
+            if self.green[i] not in (-1, L) or self.banned[i] >> L & 1:
+                return False
+            counts[L] += 1
+        for L in range(26):
+            if not self.min_count[L] <= counts[L] <= self.max_count[L]:
+                return False
+        return True
+
+    def letter_status(self):
+        """The equivalent legacy letter_status dict (for printing / categorize_global)."""
+        status = {}
+        for i in range(26):
+            ch, bit = chr(_A + i), 1 << i
+            if self.ever_green & bit:
+                state = "in_right_place"
+            elif self.ever_yellow & bit:
+                state = "in_wrong_place"
+            elif self.seen & bit:
+                state = "not_in_word"
+            else:
+                state = "not_guessed"
+            green  = {p for p in range(5) if self.green[p] == i}
+            yellow = {p for guess, colors in self.history
+                      for p, (g, c) in enumerate(zip(guess, colors)) if g == ch and c == "Y"}
+            status[ch] = {"state": state, "green": green, "yellow": yellow}
+        return status
@@ -3,28 +3,75 @@ A simple Wordle emulator in Python.
 You can manually set the SECRET_WORD to define what the answer should be.
 """
 import string
+import sys
 from word_lists import get_target
 from word_lists import is_valid_guess
-from pruning import wordlePrune, infoPrune
+import word_lists
+from pruning import wordlePrune, infoPrune, default_word_index, letterMask, popcount
+from game_state import GameState
+from opening_book import load_or_build_book
+import numpy as np
+import heapq
 import random
 
+TOP_K = 5   # make_guess picks among this many best-scoring words
+
+
+def game_rng(seed, *key):
+    """
+    random.Random for one game, e.g. game_rng(seed, opener, secret). String
+    seeds are hashed deterministically, so the same key gives the same
+    draws in every process and on every run.
+    """
+    return random.Random(":".join(str(k) for k in (seed, *key)))
+
 
 class Guesser:
-    def make_guess(self, attempt, solutions_list, information_list, letter_status):
+    def __init__(self, book=None, index=None, rng=None):
+        self.book  = book   # optional opening_book.OpeningBook consulted before searching
+        self.index = index  # pruning.WordIndex that index-array candidate sets refer to
+        self.rng   = rng if rng is not None else random.Random()   # draws among tied choices
+
+    def _word_index(self):
+        if self.index is None:
+            self.index = default_word_index()
+        return self.index
+
+    def make_guess(self, attempt, solutions_list, information_list, letter_status, history=()):
         if attempt == 1:
-            return "SALET"
-        
+            return self.book.opener if self.book is not None else "SALET"
+
+        top_choices = self.book.lookup(history) if self.book is not None else None
+        if top_choices is None:
+            top_choices = self.choices(attempt, solutions_list, information_list, letter_status)
+        if len(top_choices) == 1:
+            return top_choices[0]
+        return self.rng.choice(top_choices)
+
+    def choices(self, attempt, solutions_list, information_list, letter_status):
+        """
+        The guesses make_guess picks from at random (a single word when forced).
+        solutions_list / information_list may be word lists or NumPy index
+        arrays into self.index.words.
+        """
+        if isinstance(information_list, np.ndarray):
+            return self._choices_indexed(attempt, solutions_list, information_list, letter_status)
+
         # If narrowing down to few solutions, prioritize that
         if len(solutions_list) <= (7 - attempt):
-            return solutions_list[-1]
+            return [solutions_list[-1]]
 
-        guessed_letters = {
-            L for L, status in letter_status.items() if status["state"] != "not_guessed"
-        }
+        if isinstance(letter_status, GameState):
+            guessed_letters = letter_status.guessed_letters()
+            yellow_letters  = letter_status.yellow_letters()
+        else:
+            guessed_letters = {
+                L for L, status in letter_status.items() if status["state"] != "not_guessed"
+            }
 
-        yellow_letters = {
-            L for L, status in letter_status.items() if status["state"] == "in_wrong_place"
-        }
+            yellow_letters = {
+                L for L, status in letter_status.items() if status["state"] == "in_wrong_place"
+            }
 
         def sort_key(word):
             unique = set(word)
@@ -32,16 +79,38 @@ class Guesser:
             has_yellow = any(c in yellow_letters for c in word)
             return (-unguessed_count, -has_yellow)
 
-        sorted_words = sorted(information_list, key=sort_key)
-
         if len(information_list) == 0:
-            return solutions_list[-1]
+            return [solutions_list[-1]]
+
+        # same words, in the same order, as sorted(...)[:TOP_K]
+        return heapq.nsmallest(TOP_K, information_list, key=sort_key)
 
-        top_choices = sorted_words[:5] if len(sorted_words) >= 5 else sorted_words
-        return random.choice(top_choices)
+    def _choices_indexed(self, attempt, solutions_idx, information_idx, letter_status):
+        """choices() over index arrays, using the per-word letter masks."""
+        words = self._word_index().words
+        if len(solutions_idx) <= (7 - attempt) or len(information_idx) == 0:
+            return [words[solutions_idx[-1]]]
 
-SECRET_WORD = get_target()
-guesser = Guesser()
+        if isinstance(letter_status, GameState):
+            guessed_mask = letter_status.seen
+            yellow_mask  = letter_status.ever_yellow & ~letter_status.ever_green
+        else:
+            guessed_mask = letterMask(L for L, st in letter_status.items() if st["state"] != "not_guessed")
+            yellow_mask  = letterMask(L for L, st in letter_status.items() if st["state"] == "in_wrong_place")
+
+        masks      = self.index.masks[information_idx]
+        unguessed  = popcount(masks & np.uint32(~guessed_mask & 0x3FFFFFF)).astype(np.int32)
+        has_yellow = (masks & np.uint32(yellow_mask)) != 0
+        # same (-unguessed, -has_yellow) order as sort_key, ties by position
+        # as a stable sort would: one int key, then only the top k get sorted
+        n   = len(information_idx)
+        key = (11 - 2 * unguessed - has_yellow) * n + np.arange(n)
+        if n > TOP_K:
+            key = key[np.argpartition(key, TOP_K)[:TOP_K]]
+        order = np.sort(key) % n
+        return [words[i] for i in information_idx[order]]
+
+SECRET_WORD = None   # set to fix the answer; None picks a random target when a game starts
 
 def initialize_letter_status():
     """
@@ -143,31 +212,34 @@ def categorize_global(letter_status):
 
 
 
-def play_wordle_persistent():
+def play_wordle_persistent(secret_word=None, opener=None):
     #ChatGPT-o1
+    # opener: start with this word and take turn 2 from its opening book
+    # (built and cached under .cache/ the first time)
+    secret_word = secret_word or SECRET_WORD or get_target()
     print("Welcome to the Wordle Emulator!")
-    print(f"SECRET_WORD is set to: {SECRET_WORD} (for testing).")
+    print(f"SECRET_WORD is set to: {secret_word} (for testing).")
     print("Up to 6 attempts.\n")
 
+    guesser = Guesser()
+    if opener is not None:
+        guesser.book = load_or_build_book(opener, guesser)
+
     # Initialize the global letter status dict
     letter_status = initialize_letter_status()
 
     # Initialize the pruning list for pruning.py (can be changed for multiple pruning algorithms)
-    with open('wordle_targets.txt', 'r') as file:
-        targets = file.readlines()
-        targets = [target.strip().upper() for target in targets]
-    with open('wordle_possibles.txt', 'r') as file1:
-        possibles = file1.readlines()
-        possibles = [possible.strip().upper() for possible in possibles]
-    
-
-    # solutions_list = targets.copy()
-    solutions_list = possibles + targets
-    information_list = possibles + targets
+    all_words = list(word_lists.all_words())     # canonical dictionary, every word once
+
+    # solutions_list = list(word_lists.targets())
+    solutions_list = all_words.copy()
+    information_list = all_words.copy()
+
+    history = []                  # [(guess, colors), …] so far, for the opening book
 
     max_guesses = 6
     for attempt in range(1, max_guesses + 1):
-        guess = guesser.make_guess(attempt, solutions_list, information_list, letter_status)
+        guess = guesser.make_guess(attempt, solutions_list, information_list, letter_status, history)
         while (len(guess) != 5
         or not guess.isalpha()
         or not is_valid_guess(guess)):
@@ -185,7 +257,8 @@ def play_wordle_persistent():
             guess_in_wrong_place,
             guess_not_in_word,
             guess_colors,
-        ) = wordle_feedback_for_guess(guess, SECRET_WORD)
+        ) = wordle_feedback_for_guess(guess, secret_word)
+        history.append((guess, guess_colors))
 
         #print(guess_colors)
 
@@ -261,12 +334,14 @@ def play_wordle_persistent():
         print()
 
         # Check if guess is exactly correct
-        if guess == SECRET_WORD:
-            print(f"Congratulations! You guessed '{SECRET_WORD}' in {attempt} tries!")
+        if guess == secret_word:
+            print(f"Congratulations! You guessed '{secret_word}' in {attempt} tries!")
             return
 
-    print(f"Out of attempts! The secret word was '{SECRET_WORD}'.")
+    print(f"Out of attempts! The secret word was '{secret_word}'.")
 
         
 if __name__ == "__main__":
-    play_wordle_persistent()
\ No newline at end of file
+    # "--book=SALET" plays that opener with its opening book
+    opener = next((a.split("=", 1)[1].upper() for a in sys.argv[1:] if a.startswith("--book=")), None)
+    play_wordle_persistent(opener=opener)
\ No newline at end of file
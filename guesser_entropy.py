@@ -2,62 +2,242 @@
 A simple Wordle emulator in Python.
 You can manually set the SECRET_WORD to define what the answer should be.
 """
+import functools
 import string
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from word_lists import get_target
 from word_lists import is_valid_guess
-from pruning import wordlePrune, infoPrune
+import word_lists
+from pruning import wordlePrune, infoPrune, patternCounts, patternHistograms
+from feedback import ALL_GREEN, load_feedback_matrix
+from cache import LRUCache, fingerprint
+from opening_book import load_or_build_book
+import numpy as np
+
+# "survivors"  – original per-word loop minimizing expected survivors (cached)
+# "entropy"    – maximize Shannon entropy of the feedback distribution
+# "expected"   – minimize expected remaining solutions (vectorized "survivors")
+# "worst_case" – minimize the largest feedback bucket
+# "minimax"    – minimize losses: answers that cannot be reached in the
+#                guesses left, then the largest bucket, preferring possible
+#                answers and then a small expected bucket on ties
+SCORING_MODES = ("survivors", "entropy", "expected", "worst_case", "minimax")
+MAX_GUESSES   = 6
+# "minimax" falls back to scoring every word, not just the information
+# list, when no more than this many solutions are left and the list cannot
+# split them into singletons (only for guessers built with widen=True)
+MINIMAX_ALL_WORDS = 64
+
+
+def _minimax_keys(hist, attempt):
+    """
+    One int64 per row ordering (losses, largest bucket, not a possible
+    answer, sum of squared buckets) lexicographically.
+
+    With r <= 1 guesses left after this one, a bucket of k answers is sure
+    to lose k - r of them (one guess can only hit one answer), so losses
+    are counted from then on; earlier turns rank by the largest bucket.
+    """
+    n       = int(hist[0].sum()) if len(hist) else 0
+    live    = hist[:, :ALL_GREEN]                          # ALL_GREEN is the last column
+    left    = MAX_GUESSES - (attempt if attempt is not None else 1)
+    if left <= 1:
+        losses = np.maximum(live - left, 0).sum(axis=1, dtype=np.int64)
+    else:
+        losses = np.zeros(len(hist), dtype=np.int64)
+    largest = live.max(axis=1).astype(np.int64)
+    in_set  = hist[:, ALL_GREEN] > 0
+    sumsq   = np.einsum("ij,ij->i", hist, hist).astype(np.int64)   # <= n^2, no int32 overflow
+    # every field is at most n (n^2 for sumsq), so this stays well inside int64
+    return ((losses * (n + 1) + largest) * 2 + ~in_set) * (n * n + 1) + sumsq
+
+
+def score_histograms(hist, mode, attempt=None):
+    """
+    Score each row of a (n_guesses, 243) bucket-size array; lower is better
+    for every mode so callers can always take argmin. attempt is the turn
+    the guess is made on, used by "minimax".
+    """
+    if mode == "minimax":
+        return _minimax_keys(hist, attempt)
+    hist  = hist.astype(np.float64)
+    total = hist.sum(axis=1)
+    if mode == "entropy":
+        p = hist / total[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            h = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+        return -h
+    if mode == "expected":
+        return (hist ** 2).sum(axis=1) / total
+    if mode == "worst_case":
+        return hist.max(axis=1)
+    raise ValueError(f"unknown scoring mode {mode!r}; expected one of {SCORING_MODES}")
+
+
+# below this many (guess, solution) cells a turn is scored serially even
+# when the guesser has workers: sharding costs more than it saves
+PARALLEL_MIN_CELLS = 1 << 21
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+_worker_matrix = None
+
+
+def _attach_matrix(words):
+    """Process-pool initializer: map the feedback matrix of the parent guesser's words."""
+    global _worker_matrix
+    _worker_matrix = load_feedback_matrix(words, words)
+
+
+def _score_rows(rows, sol_idx, mode, matrix=None, attempt=None):
+    """
+    Score of each guess row against the solutions in sol_idx, lower is
+    better; "survivors" gives the exact integer total Guesser._survivors
+    computes. Process-pool workers pass matrix=None and use the copy
+    _attach_matrix mapped.
+    """
+    hist = patternHistograms(rows, sol_idx, _worker_matrix if matrix is None else matrix)
+    if mode == "survivors":
+        return (hist.astype(np.int64) ** 2).sum(axis=1)
+    return score_histograms(hist, mode, attempt)
+
 
 class Guesser:
-    def __init__(self):
-        self._fb_cache  = {}   # (guess, secret) -> feedback str
-        self._pr_cache  = {}   # (guess, feedback_str, len_solutions) -> survivor_cnt
-
-    def _feedback(self, guess, secret):
-        key = (guess, secret)
-        fb  = self._fb_cache.get(key)
-        if fb is None:
-            fb = wordle_feedback_for_guess(guess, secret)[3]
-            self._fb_cache[key] = fb
-        return fb
-
-    def _survivors(self, guess, fb, solutions):
-        key = (guess, fb, len(solutions))   # len() good enough to bind cache
+    def __init__(self, cache_bytes=64 * 2**20, mode="survivors", book=None, workers=1, executor="thread",
+                 widen=True, words=None):
+        if mode not in SCORING_MODES:
+            raise ValueError(f"unknown scoring mode {mode!r}; expected one of {SCORING_MODES}")
+        if executor not in EXECUTORS:
+            raise ValueError(f"unknown executor {executor!r}; expected one of {tuple(EXECUTORS)}")
+        self.mode       = mode
+        self.book       = book # optional opening_book.OpeningBook consulted before searching
+        self.workers    = workers  # > 1: shard each turn's guess scoring over a pool
+        self.executor   = executor # "thread" (NumPy drops the GIL) or "process"
+        self.widen      = widen    # "minimax" may guess outside solutions + information (off for hard / answers-only play)
+        self._pool      = None
+        self._matrix    = None # all-words x all-words feedback codes (mmap, loaded lazily)
+        self._words     = words # row/column -> word in self._matrix; index arrays refer to it (default word_lists.all_words())
+        self._index     = None # word -> row/column in self._matrix, for word lists
+        self._pr_cache  = LRUCache(cache_bytes)   # (guess row, solutions fingerprint) -> survivor total
+
+    def _load(self):
+        if self._matrix is None:
+            if self._words is None:
+                self._words, self._index = word_lists.all_words(), word_lists.word_ids()
+            self._matrix = load_feedback_matrix(self._words, self._words)
+
+    def _survivors(self, row, sol_idx, sol_key):
+        """
+        Sum over every secret in sol_idx of how many solutions survive the
+        guess in matrix row `row`. One partition of the solutions by feedback
+        pattern gives it directly: each bucket of size k contributes k
+        survivors k times. sol_key is fingerprint(sol_idx), computed once per
+        turn by the caller.
+        """
+        key = (row, sol_key)
         cnt = self._pr_cache.get(key)
         if cnt is None:
-            cnt = len(wordlePrune(guess, solutions, fb))
-            self._pr_cache[key] = cnt
+            counts = patternCounts(row, sol_idx, self._matrix)
+            cnt = int((counts.astype(np.int64) ** 2).sum())
+            self._pr_cache.put(key, cnt)
         return cnt
 
+    def cache_stats(self):
+        """Hit/miss/eviction counters and size of the survivor cache."""
+        return self._pr_cache.stats()
+
+    def close(self):
+        """Shut down the scoring pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
     # ------------------------------------------------------------------
-    def make_guess(self, attempt, solutions_list, information_list, letter_status):
+    def make_guess(self, attempt, solutions_list, information_list, letter_status, history=()):
         if attempt == 1:
-            return "SALET"
-
+            return self.book.opener if self.book is not None else "SALET"
+
+        if self.book is not None:
+            booked = self.book.lookup(history)
+            if booked is not None:
+                return booked[0]
+        return self._search(attempt, solutions_list, information_list)
+
+    def choices(self, attempt, solutions_list, information_list, letter_status):
+        """Single-element list of the search result; lets opening_book drive this guesser."""
+        return [self._search(attempt, solutions_list, information_list)]
+
+    def _search(self, attempt, solutions_list, information_list):
+        """
+        Best guess for this turn. The lists may be words or NumPy index
+        arrays into the guesser's words (the feedback matrix order).
+        """
+        self._load()
+        indexed = isinstance(solutions_list, np.ndarray)
+        word    = self._words.__getitem__ if indexed else (lambda w: w)
         if len(solutions_list) == 1:
-            return solutions_list[0]
-        if len(solutions_list) <= (7 - attempt) or not information_list:
-            return solutions_list[-1]
-
-        best_word     = None
-        best_expected = float("inf")
-        sol_count     = len(solutions_list)
-
-        for info_word in information_list:
-            total_after = 0
-            for secret in solutions_list:
-                fb = self._feedback(info_word, secret)
-                total_after += self._survivors(info_word, fb, solutions_list)
-                if total_after >= best_expected * sol_count:
-                    break
-            exp_after = total_after / sol_count
-            if exp_after < best_expected:
-                best_expected = exp_after
-                best_word     = info_word
-        return best_word
-
-
-SECRET_WORD = get_target()
-guesser = Guesser()
+            return word(solutions_list[0])
+        if len(solutions_list) <= (7 - attempt):
+            return word(solutions_list[-1])
+        if len(information_list) == 0 and self.mode != "minimax":
+            return word(solutions_list[-1])
+
+        if indexed:
+            sol_idx, info_rows = solutions_list, np.asarray(information_list)
+        else:
+            if self._index is None:
+                self._index = {w: i for i, w in enumerate(self._words)}
+            sol_idx   = np.array([self._index[w] for w in solutions_list])
+            info_rows = np.array([self._index[w] for w in information_list], dtype=np.intp)
+        if self.mode == "minimax":
+            return self._words[self._minimax_best(info_rows, sol_idx, attempt)]
+        return self._words[self._best_by_histogram(info_rows, sol_idx, attempt)]
+
+    def _row_scores(self, rows, sol_idx, attempt):
+        """
+        Score of each row for self.mode, lower is better. Large turns are
+        sharded over self.workers; shards are contiguous and concatenated in
+        order, so argmin picks the same first best row as a serial pass.
+        Serial "survivors" goes row by row through the survivor cache.
+        """
+        if self.workers > 1 and len(rows) * len(sol_idx) >= PARALLEL_MIN_CELLS:
+            if self._pool is None:
+                init = {"initializer": _attach_matrix, "initargs": (self._words,)} if self.executor == "process" else {}
+                self._pool = EXECUTORS[self.executor](self.workers, **init)
+            matrix = self._matrix if self.executor == "thread" else None
+            score  = functools.partial(_score_rows, sol_idx=sol_idx, mode=self.mode, matrix=matrix, attempt=attempt)
+            return np.concatenate(list(self._pool.map(score, np.array_split(rows, self.workers))))
+        if self.mode == "survivors":
+            sol_key = fingerprint(sol_idx)
+            return np.array([self._survivors(row, sol_idx, sol_key) for row in rows.tolist()], dtype=np.int64)
+        return _score_rows(rows, sol_idx, self.mode, self._matrix, attempt)
+
+    def _minimax_best(self, info_rows, sol_idx, attempt):
+        """
+        Best row for "minimax". Possible answers are scored first (they can
+        win outright), then the information words. If the best of those
+        still leaves a bucket bigger than the guesses remaining after it,
+        so a loss is possible, and only a few solutions are left, every
+        other word is tried too when self.widen allows it: a word the
+        information list pruned may still separate them.
+        """
+        rows = np.concatenate([sol_idx, info_rows[~np.isin(info_rows, sol_idx)]])
+        keys = self._row_scores(rows, sol_idx, attempt)
+        best = int(np.argmin(keys))
+        n    = len(sol_idx)
+        left = MAX_GUESSES - attempt
+        losses, largest = divmod(int(keys[best]) // (n * n + 1) // 2, n + 1)
+        if self.widen and (losses or largest > left) and left > 0 and n <= MINIMAX_ALL_WORDS:
+            rest = np.setdiff1d(np.arange(len(self._words)), rows)
+            more = self._row_scores(rest, sol_idx, attempt)
+            if len(rest) and more.min() < keys[best]:
+                return int(rest[int(np.argmin(more))])
+        return int(rows[best])
+
+    def _best_by_histogram(self, info_rows, sol_idx, attempt):
+        """Score every information word (see _row_scores); first best row wins ties."""
+        return int(info_rows[int(np.argmin(self._row_scores(info_rows, sol_idx, attempt)))])
+
+SECRET_WORD = None   # set to fix the answer; None picks a random target when a game starts
 
 def initialize_letter_status():
     """
@@ -158,31 +338,34 @@ def categorize_global(letter_status):
 
 
 
-def play_wordle_persistent():
+def play_wordle_persistent(secret_word=None, opener=None):
     #ChatGPT-o1
+    # opener: start with this word and take turn 2 from its opening book
+    # (built and cached under .cache/ the first time)
+    secret_word = secret_word or SECRET_WORD or get_target()
     print("Welcome to the Wordle Emulator!")
-    print(f"SECRET_WORD is set to: {SECRET_WORD} (for testing).")
+    print(f"SECRET_WORD is set to: {secret_word} (for testing).")
     print("Up to 6 attempts.\n")
 
+    guesser = Guesser()
+    if opener is not None:
+        guesser.book = load_or_build_book(opener, guesser)
+
     # Initialize the global letter status dict
     letter_status = initialize_letter_status()
 
     # Initialize the pruning list for pruning.py (can be changed for multiple pruning algorithms)
-    with open('wordle_targets.txt', 'r') as file:
-        targets = file.readlines()
-        targets = [target.strip().upper() for target in targets]
-    with open('wordle_possibles.txt', 'r') as file1:
-        possibles = file1.readlines()
-        possibles = [possible.strip().upper() for possible in possibles]
-    
-
-    # solutions_list = targets.copy()
-    solutions_list = possibles + targets
-    information_list = possibles + targets
+    all_words = list(word_lists.all_words())     # canonical dictionary, every word once
+
+    # solutions_list = list(word_lists.targets())
+    solutions_list = all_words.copy()
+    information_list = all_words.copy()
+
+    history = []                  # [(guess, colors), …] so far, for the opening book
 
     max_guesses = 6
     for attempt in range(1, max_guesses + 1):
-        guess = guesser.make_guess(attempt, solutions_list, information_list, letter_status)
+        guess = guesser.make_guess(attempt, solutions_list, information_list, letter_status, history)
         while (len(guess) != 5
         or not guess.isalpha()
         or not is_valid_guess(guess)):
@@ -200,7 +383,8 @@ def play_wordle_persistent():
             guess_in_wrong_place,
             guess_not_in_word,
             guess_colors,
-        ) = wordle_feedback_for_guess(guess, SECRET_WORD)
+        ) = wordle_feedback_for_guess(guess, secret_word)
+        history.append((guess, guess_colors))
 
         #print(guess_colors)
 
@@ -276,12 +460,14 @@ def play_wordle_persistent():
         print()
 
         # Check if guess is exactly correct
-        if guess == SECRET_WORD:
-            print(f"Congratulations! You guessed '{SECRET_WORD}' in {attempt} tries!")
+        if guess == secret_word:
+            print(f"Congratulations! You guessed '{secret_word}' in {attempt} tries!")
             return
 
-    print(f"Out of attempts! The secret word was '{SECRET_WORD}'.")
+    print(f"Out of attempts! The secret word was '{secret_word}'.")
 
         
 if __name__ == "__main__":
-    play_wordle_persistent()
\ No newline at end of file
+    # "--book=SALET" plays that opener with its opening book
+    opener = next((a.split("=", 1)[1].upper() for a in sys.argv[1:] if a.startswith("--book=")), None)
+    play_wordle_persistent(opener=opener)
\ No newline at end of file
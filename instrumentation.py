@@ -0,0 +1,195 @@
+"""
+Opt-in timing of the sweep's hot paths: feedback, wordlePrune, infoPrune
+and guess selection, i.e. what simulate_batch calls every turn.
+
+enable() swaps timing wrappers in for the functions listed in TARGETS and
+disable() puts the originals back, so while instrumentation is off the
+solver runs its own code untouched: no flag checks and no extra calls.
+Each wrapper records, per (stage, turn), the number of calls, the
+cumulative time and the size of the candidate set it was given. The
+simulator sets `turn` at the start of every turn.
+
+Pool workers call enable() from their initializer and hand drain() back
+with every result; the parent merge()s those into its own table and
+prints summary() at the end of the sweep. Independently, profile(dir)
+makes each process keep a cProfile of its task() blocks in
+dir/<pid>.prof, which merge_profiles() combines into one pstats file.
+"""
+import contextlib
+import cProfile
+import functools
+import glob
+import importlib
+import os
+import pstats
+import time
+
+# (stage, module, attribute, index of the candidate-set argument or None)
+TARGETS = (
+    ("feedback",    "wordle_heavy_computation", "pattern_code",       None),
+    ("wordlePrune", "wordle_heavy_computation", "wordlePruneIndices", 1),
+    ("infoPrune",   "wordle_heavy_computation", "infoPruneIndices",   1),
+    ("guess",       "guesser",                  "Guesser.choices",    2),
+    ("guess",       "guesser_entropy",          "Guesser.choices",    2),
+)
+
+turn = 0                # current turn, set by the simulator; 0 outside a game
+
+_table    = {}          # (stage, turn) -> [calls, seconds, sized calls, size sum, size max]
+_busy     = {}          # stage -> True while a call of that stage is running
+_saved    = []          # (owner, attribute, original) to restore on disable()
+_profiler = None
+_profile_dir = None
+
+
+def enabled():
+    return bool(_saved)
+
+
+def _record(stage, elapsed, size):
+    row = _table.get((stage, turn))
+    if row is None:
+        row = _table[stage, turn] = [0, 0.0, 0, 0, 0]
+    row[0] += 1
+    row[1] += elapsed
+    if size is not None:
+        row[2] += 1
+        row[3] += size
+        row[4] = max(row[4], size)
+
+
+def _wrap(stage, fn, size_arg):
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        if _busy.get(stage):                    # make_guess -> choices: count the outer call only
+            return fn(*args, **kwargs)
+        _busy[stage] = True
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _busy[stage] = False
+            size = None
+            if size_arg is not None and len(args) > size_arg and hasattr(args[size_arg], "__len__"):
+                size = len(args[size_arg])
+            _record(stage, elapsed, size)
+    return timed
+
+
+def enable():
+    """Start recording the stages in this process."""
+    if _saved:
+        return
+    for stage, module, attribute, size_arg in TARGETS:
+        owner = importlib.import_module(module)
+        *path, name = attribute.split(".")
+        for part in path:
+            owner = getattr(owner, part)
+        original = owner.__dict__[name]
+        _saved.append((owner, name, original))
+        setattr(owner, name, _wrap(stage, original, size_arg))
+
+
+def profile(profile_dir):
+    """cProfile every task() block of this process into profile_dir/<pid>.prof."""
+    global _profiler, _profile_dir
+    if _profiler is None:
+        os.makedirs(profile_dir, exist_ok=True)
+        _profiler, _profile_dir = cProfile.Profile(), profile_dir
+
+
+def disable():
+    """Put the original functions back and stop profiling; recorded numbers are kept."""
+    global _profiler, _profile_dir
+    while _saved:
+        owner, name, original = _saved.pop()
+        setattr(owner, name, original)
+    _profiler = _profile_dir = None
+
+
+@contextlib.contextmanager
+def task():
+    """cProfile the body when profiling; otherwise does nothing."""
+    if _profiler is None:
+        yield
+        return
+    _profiler.enable()
+    try:
+        yield
+    finally:
+        _profiler.disable()
+        # the profile accumulates over this process's tasks; rewrite it each time
+        _profiler.dump_stats(os.path.join(_profile_dir, f"{os.getpid()}.prof"))
+
+
+# ---------- aggregation ----------------------------------------------------
+def drain():
+    """This process's table since the last drain (None when disabled), then reset it."""
+    if not enabled():
+        return None
+    table = {key: row[:] for key, row in _table.items()}
+    _table.clear()
+    return table
+
+
+def merge(table):
+    """Add a table from drain() (e.g. a pool worker's) into this process's."""
+    for key, (calls, seconds, sized, size_sum, size_max) in (table or {}).items():
+        row = _table.setdefault(key, [0, 0.0, 0, 0, 0])
+        row[0] += calls
+        row[1] += seconds
+        row[2] += sized
+        row[3] += size_sum
+        row[4] = max(row[4], size_max)
+
+
+def reset():
+    _table.clear()
+
+
+def summary():
+    """Per-stage totals followed by the per-turn breakdown, as a text table."""
+    totals = {}
+    for (stage, _), row in _table.items():
+        total = totals.setdefault(stage, [0, 0.0, 0, 0, 0])
+        total[0] += row[0]
+        total[1] += row[1]
+        total[2] += row[2]
+        total[3] += row[3]
+        total[4] = max(total[4], row[4])
+
+    def line(stage, label, row):
+        calls, seconds, sized, size_sum, size_max = row
+        mean_size = f"{size_sum / sized:10.1f} {size_max:8d}" if sized else f"{'-':>10} {'-':>8}"
+        return f"{stage:<12} {label:>5} {calls:10d} {seconds:10.3f} {seconds / calls * 1e6:10.1f} {mean_size}"
+
+    lines = [f"{'stage':<12} {'turn':>5} {'calls':>10} {'total s':>10} {'mean us':>10} {'mean size':>10} {'max size':>8}"]
+    for stage in sorted(totals, key=lambda s: -totals[s][1]):
+        lines.append(line(stage, "all", totals[stage]))
+        for (st, t), row in sorted(_table.items()):
+            if st == stage:
+                lines.append(line(stage, str(t), row))
+    return "\n".join(lines)
+
+
+def _profile_files(profile_dir):
+    return sorted(glob.glob(os.path.join(profile_dir, "[0-9]*.prof")))
+
+
+def clear_profiles(profile_dir):
+    """Remove the per-process profiles a previous run left in profile_dir."""
+    for path in _profile_files(profile_dir):
+        os.remove(path)
+
+
+def merge_profiles(profile_dir, out=None, top=25):
+    """Combine every <pid>.prof in profile_dir into `out` (default profile_dir/sweep.prof)."""
+    files = _profile_files(profile_dir)
+    if not files:
+        return None
+    stats = pstats.Stats(*files)
+    out = out or os.path.join(profile_dir, "sweep.prof")
+    stats.dump_stats(out)
+    stats.sort_stats("cumulative").print_stats(top)
+    return out
@@ -0,0 +1,111 @@
+"""
+Opening book: for a fixed starting word, the guess choices a solver would
+make on turn 2 (and optionally turn 3) for every feedback pattern.
+
+With a fixed opener the turn-2 state depends only on the 243-way feedback,
+so the solver's answer can be computed once per pattern, saved under
+.cache/ and looked up by the guessers before they fall back to search.
+
+Entries are keyed on the game history, e.g. "SALET:BYBBB" for turn 2 or
+"SALET:BYBBB/CRONY:GBBYB" for turn 3, and hold the list of equally good
+choices the guesser returned (one word for the entropy guesser, the top
+candidates for the heuristic one, which still picks among them at random).
+"""
+import json
+import os
+
+import numpy as np
+
+from feedback import CACHE_DIR, PATTERN_COLORS, ALL_GREEN, default_word_lists, feedback_codes, word_list_hash
+from game_state import GameState
+from pruning import wordlePrune, infoPrune
+
+BOOK_VERSION = 1
+
+
+def history_key(history):
+    """[(guess, colors), …] -> "GUESS:COLORS/GUESS:COLORS"."""
+    return "/".join(f"{g}:{c}" for g, c in history)
+
+
+class OpeningBook:
+    def __init__(self, opener, entries, depth=2):
+        self.opener  = opener
+        self.entries = entries      # history_key -> [choices]
+        self.depth   = depth        # last turn covered by the book
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, history):
+        """Choices for the next turn after `history`, or None if not in the book."""
+        if not history or history[0][0] != self.opener or len(history) >= self.depth:
+            return None
+        return self.entries.get(history_key(history))
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, opener, guesser, depth=2, words=None, initial_status=None, hard=False):
+        """
+        Ask `guesser.choices(...)` for every reachable state up to turn
+        `depth`, starting from the full word list. Only patterns some
+        secret in `words` can actually produce are expanded. With hard=True
+        the guesser only gets words consistent with the feedback so far.
+        """
+        words   = list(words) if words is not None else default_word_lists()[0]
+        status  = initial_status if initial_status is not None else GameState()
+        entries = {}
+
+        def expand(history, sols, info, letter_status, secrets, attempt):
+            guess = history[-1][0]
+            codes = feedback_codes(guess, secrets)
+            for code in np.unique(codes):
+                if code == ALL_GREEN:
+                    continue
+                colors  = PATTERN_COLORS[code]
+                hist    = history[:-1] + [(guess, colors)]
+                sols2   = wordlePrune(guess, sols, colors)
+                info2   = sols2 if hard else infoPrune(guess, info, colors)
+                status2 = letter_status.copy()
+                status2.apply(guess, colors)
+                choices = list(guesser.choices(attempt, sols2, info2, status2))
+                entries[history_key(hist)] = choices
+                if attempt < depth:
+                    bucket = [s for s, c in zip(secrets, codes) if c == code]
+                    for nxt in choices:
+                        expand(hist + [(nxt, None)], sols2, info2, status2, bucket, attempt + 1)
+
+        expand([(opener, None)], words, words, status, words, 2)
+        return cls(opener, entries, depth)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": BOOK_VERSION, "opener": self.opener,
+                       "depth": self.depth, "entries": self.entries}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != BOOK_VERSION:
+            raise ValueError(f"{path}: opening book version {data.get('version')}, expected {BOOK_VERSION}")
+        return cls(data["opener"], data["entries"], data["depth"])
+
+
+def book_path(opener, guesser, depth=2, words=None, hard=False):
+    words = list(words) if words is not None else default_word_lists()[0]
+    kind  = f"{type(guesser).__module__}-{getattr(guesser, 'mode', 'default')}{'-hard' if hard else ''}"
+    return os.path.join(CACHE_DIR, f"book_v{BOOK_VERSION}_{opener}_{kind}_d{depth}_{word_list_hash(words, [])}.json")
+
+
+def load_or_build_book(opener, guesser, depth=2, words=None, hard=False):
+    """Opening book for (opener, guesser kind, depth, word list, hard mode), built and saved on first use."""
+    path = book_path(opener, guesser, depth, words, hard)
+    if os.path.exists(path):
+        return OpeningBook.load(path)
+    book = OpeningBook.build(opener, guesser, depth, words, hard=hard)
+    book.save(path)
+    return book
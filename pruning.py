@@ -1,3 +1,10 @@
+import functools
+
+import numpy as np
+
+from feedback import N_PATTERNS
+from word_lists import all_words, encode_words
+
 # this method prunes the list of possible words from the guess that has been made
 # guess - (string) word used to get
 # currentWordList - (array) list of words still possible originating from the text file
@@ -32,6 +39,9 @@ def wordlePrune(guess, currentWordList, guessColors):
                 if g_c not in word:     # … but must be elsewhere
                     valid = False
                     break
+            elif w_c == g_c:            # a gray spot would have been green
+                valid = False
+                break
 
         if not valid:
             continue
@@ -47,12 +57,13 @@ def wordlePrune(guess, currentWordList, guessColors):
 
         # 3. duplicate‑letter count check
         # For each unique letter in the guess, the candidate word must contain
-        # at least as many occurrences as the number of G+Y for that letter.
+        # at least as many occurrences as the number of G+Y for that letter,
+        # and exactly that many if the letter was also gray.
         from collections import Counter
         gcount = Counter([c for c, col in zip(guess, guessColors) if col in "GY"])
         wcount = Counter(word)
         for letter, need in gcount.items():
-            if wcount[letter] < need:
+            if wcount[letter] < need or (letter in grays and wcount[letter] > need):
                 valid = False
                 break
         if valid:
@@ -109,6 +120,197 @@ def infoPrune(guess, currentWordList, guessColors):
 
 
 
+class WordIndex:
+    """
+    A word list encoded once for the indexed pruners: per-position letter
+    codes, a 26-bit letter-presence mask, per-letter counts and an
+    all-letters-distinct flag for every word. Candidate sets are then just
+    index arrays into self.words.
+
+    `arrays` ({name: array} for every name in ARRAYS, e.g. the views of a
+    shared_words.SharedWordTable) are used as they are instead of being
+    derived from the words again.
+    """
+    ARRAYS = ("letters", "counts", "masks", "distinct")
+
+    def __init__(self, words, arrays=None):
+        self.words = list(words)
+        if arrays is None:
+            arrays = self.derive(encode_words(self.words))
+        self.letters, self.counts, self.masks, self.distinct = (arrays[name] for name in self.ARRAYS)
+
+    @staticmethod
+    def derive(letters):
+        """The ARRAYS of an (n, 5) encode_words array."""
+        n = len(letters)
+        counts = np.zeros((n, 26), dtype=np.uint8)                  # (n, 26) letter counts
+        for i in range(5):
+            np.add.at(counts, (np.arange(n), letters[:, i]), 1)
+        bits  = np.uint32(1) << np.arange(26, dtype=np.uint32)
+        masks = ((counts > 0) * bits).sum(axis=1, dtype=np.uint32)  # (n,) presence bits
+        return {"letters": letters,                                 # (n, 5)  A=0 … Z=25
+                "counts": counts,
+                "masks": masks,
+                "distinct": popcount(masks) == 5}                   # (n,) no repeated letter
+
+    def __len__(self):
+        return len(self.words)
+
+    def all(self):
+        return np.arange(len(self.words))
+
+
+@functools.lru_cache(maxsize=None)
+def default_word_index():
+    """WordIndex over word_lists.all_words(), built once per process."""
+    return WordIndex(all_words())
+
+
+def _letter(ch):
+    return ord(ch) - ord("A")
+
+
+def letterMask(letters):
+    """26-bit mask of an iterable of upper-case letters."""
+    mask = 0
+    for ch in letters:
+        mask |= 1 << _letter(ch)
+    return mask
+
+
+def popcount(masks):
+    """Number of set bits in each uint32 mask."""
+    if hasattr(np, "bitwise_count"):                    # NumPy >= 2.0
+        return np.bitwise_count(masks)
+    m = np.asarray(masks, dtype=np.uint32)
+    m = m - ((m >> 1) & 0x55555555)
+    m = (m & 0x33333333) + ((m >> 2) & 0x33333333)
+    m = (m + (m >> 4)) & 0x0F0F0F0F
+    return ((m * 0x01010101) & 0xFFFFFFFF) >> 24
+
+
+def wordlePruneIndices(guess, candidates, guessColors, index):
+    """
+    Indexed wordlePrune: same survivors, but candidates is an index array
+    into index.words (None = every word) and the result is the surviving
+    index array, in the same order.
+    """
+    idx = index.all() if candidates is None else np.asarray(candidates)
+    keep = np.ones(len(idx), dtype=bool)
+    letters = index.letters[idx]
+
+    need = {}                                   # letter -> G+Y occurrences
+    for i, (ch, color) in enumerate(zip(guess, guessColors)):
+        L = _letter(ch)
+        if color == "G":
+            keep &= letters[:, i] == L
+            need[L] = need.get(L, 0) + 1
+        elif color == "Y":
+            keep &= letters[:, i] != L
+            need[L] = need.get(L, 0) + 1
+        else:                                   # a gray spot would have been green
+            keep &= letters[:, i] != L
+
+    # gray letters are banned outright unless also G/Y (double-letter rule)
+    banned = 0
+    capped = set()                              # gray and G/Y: the count is exact
+    for ch, color in zip(guess, guessColors):
+        if color == "B":
+            if _letter(ch) in need:
+                capped.add(_letter(ch))
+            else:
+                banned |= 1 << _letter(ch)
+    if banned:
+        keep &= (index.masks[idx] & np.uint32(banned)) == 0
+
+    # minimum counts; also covers "yellow letter must be somewhere"
+    for L, n in need.items():
+        if L in capped:
+            keep &= index.counts[idx, L] == n
+        else:
+            keep &= index.counts[idx, L] >= n
+
+    return idx[keep]
+
+
+def infoPruneIndices(guess, candidates, guessColors, index):
+    """
+    Indexed infoPrune: same survivors, as an index array into index.words
+    (candidates None = every word).
+
+    The repeated-letter filter and the gray bans are one pass over the
+    precomputed flags and masks; only the words that pass are looked at
+    letter by letter for the green / yellow spots.
+    """
+    idx = index.all() if candidates is None else np.asarray(candidates)
+    grays = letterMask(ch for ch, color in zip(guess, guessColors) if color == "B")
+    keep  = index.distinct[idx]                 # any repeated char → out
+    if grays:                                   # grays are forbidden outright
+        keep &= (index.masks[idx] & np.uint32(grays)) == 0
+    idx = idx[keep]
+
+    # a green / yellow letter may not sit in that spot
+    spots = [(i, _letter(ch)) for i, (ch, color) in enumerate(zip(guess, guessColors)) if color != "B"]
+    if spots and len(idx):
+        cols, banned = zip(*spots)
+        keep = (index.letters[idx][:, cols] != np.array(banned, dtype=index.letters.dtype)).all(axis=1)
+        idx = idx[keep]
+    return idx
+
+
+# ---------- Pattern-partition pruning on the feedback matrix ------------------
+# A candidate is consistent with a guess exactly when its feedback pattern
+# equals the observed one, so with a precomputed matrix (feedback.py) pruning
+# is one integer comparison per candidate. This is the exact Wordle-consistent
+# set, the same one wordlePrune / wordlePruneIndices keep.
+
+def patternPruneIndices(guessRow, candidates, pattern, matrix):
+    """Candidates (column indices of matrix) whose pattern under guessRow equals pattern."""
+    candidates = np.asarray(candidates)
+    return candidates[matrix[guessRow, candidates] == pattern]
+
+
+def patternCounts(guessRow, candidates, matrix):
+    """Size of each of the 243 feedback buckets guessRow splits candidates into."""
+    return np.bincount(matrix[guessRow, candidates], minlength=N_PATTERNS)
+
+
+def patternHistograms(guessRows, candidates, matrix, maxCells=1 << 20):
+    """
+    patternCounts for many guesses in one vectorized pass: a
+    (len(guessRows), 243) array of bucket sizes. Rows are processed in
+    blocks of about maxCells entries so temporaries stay cache-sized.
+    """
+    guessRows  = np.asarray(guessRows)
+    candidates = np.asarray(candidates)
+    hist   = np.empty((len(guessRows), N_PATTERNS), dtype=np.int32)
+    # bound both the gathered codes and the bincount output by maxCells
+    block  = max(1, maxCells // max(N_PATTERNS, len(candidates)))
+    # give each row its own 243-wide slice so one bincount does the block
+    offset = (np.arange(block, dtype=np.int32) * N_PATTERNS)[:, None]
+    # few candidates: gather just those cells instead of copying whole rows
+    sparse = len(candidates) * 8 < matrix.shape[1]
+    for start in range(0, len(guessRows), block):
+        rows  = guessRows[start:start + block]
+        if sparse:
+            codes = matrix[rows[:, None], candidates]
+        else:
+            codes = np.take(matrix[rows], candidates, axis=1)
+        flat  = (codes + offset[:len(rows)]).ravel()
+        hist[start:start + len(rows)] = np.bincount(
+            flat, minlength=len(rows) * N_PATTERNS).reshape(len(rows), N_PATTERNS)
+    return hist
+
+
+def patternPartition(guessRow, candidates, matrix):
+    """All 243 buckets in one pass: list whose entry p is patternPruneIndices(…, p, …)."""
+    candidates = np.asarray(candidates)
+    codes = matrix[guessRow, candidates]
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=N_PATTERNS)
+    return np.split(candidates[order], np.cumsum(counts)[:-1])
+
+
 def load_words(filename):
     with open(filename, 'r') as file:
         return [line.strip() for line in file if line.strip()]
@@ -0,0 +1,117 @@
+"""
+Sweep results in one SQLite table instead of a pickled {word: counts} dict:
+
+    runs(word, solver, list_hash, engine, seed, c1 … c7)
+        key (word, solver, list_hash, engine, seed)
+
+c1 … c6 count games solved in that many guesses and c7 the losses, as in
+wordle_heavy_computation.worker. A RunKey names what produced the counts:
+list_hash is feedback.word_list_hash of the word lists the run used, engine
+the simulator's ENGINE_VERSION and seed the sweep seed, so results from
+different dictionaries, simulator behaviour or seeds never mix. Rows that
+predate engine versioning (old stores, imported results.pkl) are kept as
+LEGACY_ENGINE / UNSEEDED and never match a current run.
+
+Rows are upserted one run at a time (a running sweep can write as it goes)
+and ranking queries run in SQL rather than over a loaded dict.
+"""
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+RESULTS_DB    = "results.sqlite"
+LEGACY_ENGINE = 0               # engine of rows written before engines were versioned
+UNSEEDED      = -1              # seed of rows from unseeded runs
+
+RunKey = namedtuple("RunKey", "list_hash engine seed")
+
+_BINS      = [f"c{i}" for i in range(1, 8)]
+_GAMES     = " + ".join(_BINS)
+_SOLVED    = " + ".join(_BINS[:6])
+_KEY_MATCH = "list_hash = ? AND engine = ? AND seed = ?"
+# lower is better for all of them
+RANKINGS   = {
+    "loss": f"1.0 * c7 / ({_GAMES})",                                          # share of games lost
+    "mean": f"1.0 * ({' + '.join(f'{i} * c{i}' for i in range(1, 7))}) / ({_SOLVED})",  # guesses per win
+    "guesses": f"1.0 * ({' + '.join(f'{i} * c{i}' for i in range(1, 8))}) / ({_GAMES})",  # per game, a loss = 7
+}
+
+
+class ResultsStore:
+    def __init__(self, path=RESULTS_DB):
+        self.path = path
+        self._db  = sqlite3.connect(path)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(runs)")]
+        if columns and "engine" not in columns:
+            self._db.execute("ALTER TABLE runs RENAME TO runs_unversioned")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " word TEXT NOT NULL, solver TEXT NOT NULL, list_hash TEXT NOT NULL,"
+            " engine INTEGER NOT NULL, seed INTEGER NOT NULL, "
+            + ", ".join(f"{c} INTEGER NOT NULL" for c in _BINS) +
+            ", PRIMARY KEY (word, solver, list_hash, engine, seed)) WITHOUT ROWID")
+        if columns and "engine" not in columns:        # a store from before RunKey
+            self._db.execute(
+                f"INSERT INTO runs SELECT word, solver, list_hash, {LEGACY_ENGINE}, {UNSEEDED}, "
+                f"{', '.join(_BINS)} FROM runs_unversioned")
+            self._db.execute("DROP TABLE runs_unversioned")
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    def upsert_many(self, rows):
+        """Insert or replace (word, solver, RunKey, counts[7]) rows in one transaction."""
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, {', '.join('?' * 7)})",
+                ((word, solver, *key, *(int(c) for c in counts))
+                 for word, solver, key, counts in rows))
+
+    def upsert(self, word, solver, key, counts):
+        self.upsert_many([(word, solver, key, counts)])
+
+    def keys(self):
+        """Every RunKey with rows in the store."""
+        return [RunKey(*row) for row in self._db.execute(
+            "SELECT DISTINCT list_hash, engine, seed FROM runs ORDER BY list_hash, engine, seed")]
+
+    def solvers(self, key):
+        return [s for (s,) in self._db.execute(
+            f"SELECT DISTINCT solver FROM runs WHERE {_KEY_MATCH} ORDER BY solver", key)]
+
+    def results(self, key, solver="normal"):
+        """{word: counts[7]} for one solver and RunKey, like the old results.pkl."""
+        rows = self._db.execute(
+            f"SELECT word, {', '.join(_BINS)} FROM runs WHERE {_KEY_MATCH} AND solver = ? ORDER BY word",
+            (*key, solver))
+        return {word: np.array(counts, dtype=np.int32) for word, *counts in rows}
+
+    def top(self, key, k=None, by="loss", solver="normal"):
+        """
+        [(word, score, counts[7]), …] best first by `by` ("loss": share of
+        games lost, "mean": guesses per solved game, "guesses": guesses per
+        game with a loss counted as 7); ties go alphabetically
+        and words that never won rank last on "mean". k=None returns every word.
+        """
+        if by not in RANKINGS:
+            raise ValueError(f"unknown ranking {by!r}; expected one of {tuple(RANKINGS)}")
+        sql = (f"SELECT word, {RANKINGS[by]} AS score, {', '.join(_BINS)} FROM runs"
+               f" WHERE {_KEY_MATCH} AND solver = ? ORDER BY score IS NULL, score, word")
+        args = (*key, solver)
+        if k is not None:
+            sql += " LIMIT ?"
+            args += (k,)
+        return [(word, score, np.array(counts, dtype=np.int32))
+                for word, score, *counts in self._db.execute(sql, args)]
@@ -0,0 +1,104 @@
+"""
+Word lists packed once into multiprocessing.shared_memory, together with
+the arrays pruning.WordIndex derives from them, so pool workers attach to
+the parent's copy instead of re-reading, re-parsing and re-encoding the
+word files.
+
+The block holds, for n words:
+    masks     (n,)     uint32   26-bit letter-presence mask
+    letters   (n, 5)   uint8    A=0 … Z=25
+    counts    (n, 26)  uint8    per-letter counts
+    distinct  (n,)     bool     no repeated letter
+
+Parent:
+    table = SharedWordTable.create(possibles + targets)
+    Pool(initializer=attach, initargs=(table.name, len(table)))
+    …
+    table.close(); table.unlink()
+
+Worker:
+    table = SharedWordTable.attach(name, n)
+    index = table.word_index()            # WordIndex over the shared arrays
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pruning import WordIndex
+from word_lists import decode_words, encode_words
+
+# (name, dtype, row shape); widest dtype first so every array stays aligned
+_LAYOUT = (
+    ("masks",    np.uint32, ()),
+    ("letters",  np.uint8,  (5,)),
+    ("counts",   np.uint8,  (26,)),
+    ("distinct", np.bool_,  ()),
+)
+
+
+def _row_bytes():
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in _LAYOUT)
+
+
+class SharedWordTable:
+    def __init__(self, shm, n, owner):
+        self._shm   = shm
+        self._owner = owner
+        self.arrays = {}
+        offset = 0
+        for name, dtype, shape in _LAYOUT:
+            array = np.ndarray((n, *shape), dtype=dtype, buffer=shm.buf, offset=offset)
+            if not owner:
+                array.flags.writeable = False        # workers only read the parent's copy
+            self.arrays[name] = array
+            offset += array.nbytes
+        self.letters = self.arrays["letters"]
+
+    def __len__(self):
+        return len(self.letters)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @classmethod
+    def create(cls, words, index=None):
+        """
+        Encode `words` and their WordIndex arrays into a new shared block
+        owned by this process; `index`, a WordIndex over the same words,
+        saves deriving the arrays again.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(words) * _row_bytes()))
+        table = cls(shm, len(words), owner=True)
+        if index is None:
+            arrays = WordIndex.derive(encode_words(words))
+        else:
+            arrays = {name: getattr(index, name) for name in WordIndex.ARRAYS}
+        for name, array in arrays.items():
+            table.arrays[name][:] = array
+        return table
+
+    @classmethod
+    def attach(cls, name, n):
+        """Zero-copy view of a table created by another process."""
+        # pool workers share the parent's resource tracker, so attaching
+        # does not hand the segment's lifetime to the worker
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, n, owner=False)
+
+    def words(self, start=0, stop=None):
+        """Decode rows start:stop back into upper-case strings."""
+        return decode_words(self.letters[start:stop])
+
+    def word_index(self, words=None):
+        """WordIndex whose arrays are views of this table; `words` defaults to the decoded rows."""
+        return WordIndex(self.words() if words is None else words, self.arrays)
+
+    def close(self):
+        self.letters = None
+        self.arrays  = {}
+        self._shm.close()
+
+    def unlink(self):
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,52 @@
+"""
+feedback_codes (the batch kernel) against wordle_feedback_for_guess, the
+reference scorer, over the whole dictionary.
+"""
+import random
+
+import numpy as np
+import pytest
+
+import word_lists
+from feedback import PATTERN_COLORS, colors_to_code, feedback_codes, pattern_code
+from wordle import wordle_feedback_for_guess
+
+DUPLICATE_GUESSES = ("EERIE", "LLAMA", "ABBEY")
+
+
+@pytest.fixture(scope="module")
+def words():
+    return list(word_lists.all_words())
+
+
+def _sample_guesses(words, n=25, seed=2):
+    return random.Random(seed).sample(words, n) + list(DUPLICATE_GUESSES)
+
+
+def test_kernel_matches_reference_on_every_word(words):
+    for guess in _sample_guesses(words):
+        codes = feedback_codes(guess, words)
+        expected = [colors_to_code(wordle_feedback_for_guess(guess, w)[3]) for w in words]
+        mismatches = np.flatnonzero(codes != np.array(expected, dtype=np.uint8))
+        assert not len(mismatches), [(guess, words[i], PATTERN_COLORS[codes[i]]) for i in mismatches[:5]]
+
+
+def test_block_matches_single_guesses(words):
+    guesses = _sample_guesses(words, n=5)
+    block = feedback_codes(guesses, words)
+    for row, guess in zip(block, guesses):
+        assert np.array_equal(row, feedback_codes(guess, words))
+
+
+@pytest.mark.parametrize("guess, answer, colors", [
+    ("EERIE", "THEME", "YBBBG"),
+    ("EERIE", "EERIE", "GGGGG"),
+    ("LLAMA", "HELLO", "YYBBB"),
+    ("LLAMA", "SALAL", "YYYBY"),
+    ("ABBEY", "BABES", "YYGGB"),
+    ("ABBEY", "KEBAB", "YYGYB"),
+])
+def test_duplicate_letters(guess, answer, colors):
+    assert wordle_feedback_for_guess(guess, answer)[3] == colors
+    assert PATTERN_COLORS[feedback_codes(guess, [answer])[0]] == colors
+    assert PATTERN_COLORS[pattern_code(guess, answer)] == colors
@@ -0,0 +1,43 @@
+"""
+Importing the solver modules must stay cheap: under benchmarks.IMPORT_BUDGET_S
+in a fresh interpreter, without pulling in matplotlib or tqdm and without
+opening any data file (word lists, caches, matrices, results).
+"""
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks import IMPORT_BUDGET_S, SOLVER_MODULES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_PROBE = """
+import json, sys, time
+opened = []
+sys.addaudithook(lambda event, args: opened.append(str(args[0])) if event == "open" else None)
+start = time.perf_counter()
+{imports}
+took = time.perf_counter() - start
+print(json.dumps({{"seconds": took, "opened": opened,
+                  "heavy": [m for m in ("matplotlib", "tqdm") if m in sys.modules]}}))
+"""
+
+CODE_SUFFIXES = (".py", ".pyc", ".so", ".pyd")
+
+
+def _fresh_import():
+    code = _PROBE.format(imports="\n".join(f"import {m}" for m in SOLVER_MODULES))
+    out = subprocess.run([sys.executable, "-c", code], check=True, cwd=HERE,
+                         capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def test_import_time_and_side_effects():
+    runs = [_fresh_import() for _ in range(3)]
+    best = min(run["seconds"] for run in runs)
+    assert best <= IMPORT_BUDGET_S, f"importing {SOLVER_MODULES} took {best:.3f}s"
+    for run in runs:
+        assert run["heavy"] == []
+        data = [path for path in run["opened"] if not path.endswith(CODE_SUFFIXES)]
+        assert data == [], data
@@ -0,0 +1,82 @@
+"""
+The indexed pruners against the string ones, for every one of the 243
+feedback patterns, wordlePrune against exact pruning on the feedback
+matrix and on hand-picked gray-letter cases, and patternPartition against
+patternPruneIndices.
+"""
+import random
+
+import numpy as np
+import pytest
+
+import word_lists
+from feedback import N_PATTERNS, PATTERN_COLORS, build_feedback_matrix, feedback_codes, pattern_code
+from pruning import (default_word_index, infoPrune, infoPruneIndices, patternPartition, patternPruneIndices,
+                     wordlePrune, wordlePruneIndices)
+
+GUESSES = ("SALET", "EERIE", "ABBEY")
+
+
+@pytest.fixture(scope="module")
+def index():
+    return default_word_index()
+
+
+@pytest.mark.parametrize("guess", GUESSES)
+def test_indexed_pruners_match_on_every_pattern(index, guess):
+    words = index.words
+    for code in range(N_PATTERNS):
+        colors = PATTERN_COLORS[code]
+        assert [words[i] for i in wordlePruneIndices(guess, None, colors, index)] == \
+            wordlePrune(guess, words, colors), colors
+        assert [words[i] for i in infoPruneIndices(guess, None, colors, index)] == \
+            infoPrune(guess, words, colors), colors
+
+
+def test_indexed_pruners_keep_candidate_order(index):
+    rng = random.Random(4)
+    subset = np.array(sorted(rng.sample(range(len(index)), 3000)))
+    words = [index.words[i] for i in subset]
+    for guess in GUESSES:
+        colors = PATTERN_COLORS[pattern_code(guess, rng.choice(word_lists.targets()))]
+        assert [index.words[i] for i in wordlePruneIndices(guess, subset, colors, index)] == \
+            wordlePrune(guess, words, colors)
+        assert [index.words[i] for i in infoPruneIndices(guess, subset, colors, index)] == \
+            infoPrune(guess, words, colors)
+
+
+def test_wordle_prune_is_exact(index):
+    """wordlePrune keeps exactly the words that would give the same feedback."""
+    rng = random.Random(5)
+    words = index.words
+    for guess in GUESSES + tuple(rng.sample(words, 20)):
+        codes = feedback_codes(guess, words)
+        for answer in rng.sample(words, 5):
+            code = pattern_code(guess, answer)
+            expected = np.flatnonzero(codes == code)
+            assert np.array_equal(wordlePruneIndices(guess, None, PATTERN_COLORS[code], index), expected), \
+                (guess, answer)
+
+
+@pytest.mark.parametrize("guess, answer, colors, ruled_out", [
+    ("BUBBY", "BUGGY", "GGBBG", "BUBBY"),   # the guess itself: gray B spots, and only one B
+    ("BUBBY", "ABACK", "YBBBB", "ADOBO"),   # a gray spot cannot hold that letter
+    ("BUBBY", "ALBUM", "BYGBB", "ZEBUB"),   # B is gray and green: exactly one B
+])
+def test_gray_letter_rules(index, guess, answer, colors, ruled_out):
+    assert PATTERN_COLORS[pattern_code(guess, answer)] == colors
+    assert wordlePrune(guess, [ruled_out, answer], colors) == [answer]
+    ids = np.array([word_lists.word_ids()[w] for w in (ruled_out, answer)])
+    assert [index.words[i] for i in wordlePruneIndices(guess, ids, colors, index)] == [answer]
+
+
+def test_pattern_partition_matches_prune_on_every_pattern(index):
+    rng     = random.Random(6)
+    guesses = list(GUESSES) + rng.sample(index.words, 5)
+    matrix  = build_feedback_matrix(guesses, rng.sample(index.words, 2000))
+    subset  = np.array(sorted(rng.sample(range(matrix.shape[1]), 1500)))
+    for row in range(len(guesses)):
+        buckets = patternPartition(row, subset, matrix)
+        assert len(buckets) == N_PATTERNS
+        for code in range(N_PATTERNS):
+            assert np.array_equal(buckets[code], patternPruneIndices(row, subset, code, matrix)), (guesses[row], code)
@@ -0,0 +1,68 @@
+"""
+The simulator's solver variants: the lockstep batch plays exactly the
+games simulate_wordle_game plays one by one, guesses stay inside the
+lists a mode allows, and successive halving picks the full sweep's top k.
+"""
+import random
+
+import numpy as np
+import pytest
+
+import guesser_entropy
+import wordle_heavy_computation as sim
+from results_store import ResultsStore
+
+OPENERS = ("SALET", "CRANE", "FUZZY")
+HALVING_OPENERS = ("SALET", "CRANE", "TRACE", "FUZZY", "JAZZY", "MOMMY")
+
+
+@pytest.fixture(scope="module")
+def targets():
+    sim.load_word_lists()
+    return random.Random(3).sample(sim.TARGETS, 300)
+
+
+@pytest.mark.parametrize("solver, n", [("normal", 150), ("hard", 150), ("answers", 150), ("normal-entropy", 30)])
+def test_batch_matches_per_game(targets, solver, n):
+    secrets = targets[:n]
+    for opener in ("SALET", "FUZZY"):
+        per_game = [sim.simulate_wordle_game(opener, s, solver, seed=7) for s in secrets]
+        assert sim.simulate_batch(opener, secrets, solver, seed=7).tolist() == per_game
+
+
+@pytest.mark.parametrize("solver", ["hard-minimax", "answers-minimax", "hard-entropy", "answers-expected"])
+def test_restricted_modes_guess_inside_their_lists(monkeypatch, targets, solver):
+    """hard and answers play every guess from solutions ∪ information."""
+    outside = []
+    choices = guesser_entropy.Guesser.choices
+
+    def checked(self, attempt, solutions_list, information_list, letter_status):
+        result  = choices(self, attempt, solutions_list, information_list, letter_status)
+        allowed = {sim.ALL_WORDS[i] for i in np.concatenate([solutions_list, information_list])}
+        outside.extend(w for w in result if w not in allowed)
+        return result
+
+    monkeypatch.setattr(guesser_entropy.Guesser, "choices", checked)
+    for opener in OPENERS:
+        sim.simulate_batch(opener, targets, solver)
+    assert outside == [], sorted(set(outside))[:10]
+
+
+@pytest.fixture(scope="module")
+def swept(tmp_path_factory):
+    """A full sweep of HALVING_OPENERS, in a throwaway results store."""
+    tmp   = tmp_path_factory.mktemp("sweep")
+    store = ResultsStore(str(tmp / "results.sqlite"))
+    sim.run_sweep(HALVING_OPENERS, checkpoint=str(tmp / "checkpoint.tsv"), processes=2, store=store)
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("by", ["loss", "guesses"])
+def test_halving_matches_full_sweep(swept, by):
+    top = sim.run_halving(HALVING_OPENERS, k=2, processes=2, by=by, first=64)
+    expected = swept.top(sim.run_key(), 2, by)
+    assert [w for w, _, _ in top] == [w for w, _, _ in expected]
+    for (_, score, counts), (_, want_score, want_counts) in zip(top, expected):
+        assert score == pytest.approx(want_score)
+        assert np.array_equal(counts, want_counts)
@@ -1,24 +1,154 @@
+"""
+Word-list registry: every list is read from disk once per process and then
+served from memory as immutable tuples, frozen sets for O(1) validation,
+word -> id maps and (n, 5) letter arrays.
+
+The two files are merged into one canonical dictionary (dictionary()):
+normalized, deduplicated and validated, with a flag marking the answers.
+all_words(), possibles() and targets() are all views of it, so no word is
+ever searched or simulated twice.
+
+The dictionary can be precompiled with compile_word_lists() (or by running
+this module) into a .npz under .cache/, keyed on DICTIONARY_VERSION and on
+both files' size and mtime; when a fresh copy exists it is loaded instead
+of parsing the text.
+"""
+import functools
+import os
 import random
+import re
+import types
+
+import numpy as np
+
+DATA_DIR       = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR      = os.path.join(DATA_DIR, ".cache")
+POSSIBLES_FILE = 'wordle_possibles.txt'
+TARGETS_FILE   = 'wordle_targets.txt'
+_WORD_RE       = re.compile(r"[A-Z]{5}")
+DICTIONARY_VERSION = 1      # bump when the compiled dictionary's layout changes
 
 #Choose a random word
 def get_target():
-    with open('wordle_targets.txt', 'r') as file:
-        targets = file.readlines()
-        targets = [target.strip().upper() for target in targets]
-    answer = random.choice(targets)
+    answer = random.choice(targets())
     return answer
 
+def read_words(filename):
+    """Read one word list file as stripped, upper-cased words (blank lines dropped)."""
+    with open(filename, 'r') as file:
+        return [line.strip().upper() for line in file if line.strip()]
+
 def is_valid_guess(guess):
-    with open('wordle_possibles.txt', 'r') as file1:
-        possibles = file1.readlines()
-        possibles = [possible.strip().upper() for possible in possibles]
-    with open('wordle_targets.txt', 'r') as file2:
-        targets = file2.readlines()
-        targets = [target.strip().upper() for target in targets]
-    possibles.extend(targets)
-    full_list = set(possibles)
-    # print(full_list)
-    if (guess in full_list):
-        return True
+    return guess in valid_guesses()
+
+
+# ---------- Encoded forms ------------------------------------------------
+def encode_words(words):
+    """Words -> (n, 5) uint8 array of letters (A=0 … Z=25)."""
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return (raw.reshape(len(words), 5) - ord("A")).astype(np.uint8)
+
+def decode_words(letters):
+    """(n, 5) letter array -> list of upper-case words."""
+    raw = (np.asarray(letters, dtype=np.uint8) + ord("A")).tobytes().decode("ascii")
+    return [raw[i:i + 5] for i in range(0, len(raw), 5)]
+
+def _path(filename):
+    return filename if os.path.isabs(filename) else os.path.join(DATA_DIR, filename)
+
+def _dictionary_path():
+    keys = []
+    for filename in (POSSIBLES_FILE, TARGETS_FILE):
+        st = os.stat(_path(filename))
+        keys.append(f"{st.st_size}_{st.st_mtime_ns}")
+    return os.path.join(CACHE_DIR, f"dictionary_v{DICTIONARY_VERSION}_{'_'.join(keys)}.npz")
+
+def build_dictionary(possibles_file=POSSIBLES_FILE, targets_file=TARGETS_FILE):
+    """
+    Merge both word files into the canonical table: possibles first, then
+    targets, each word kept at its first occurrence. Returns (words,
+    is_answer) where is_answer[i] says whether words[i] is in the targets
+    file. Raises ValueError if any entry is not five letters A-Z.
+    """
+    possibles_ = read_words(_path(possibles_file))
+    targets_   = read_words(_path(targets_file))
+    bad = [w for w in possibles_ + targets_ if not _WORD_RE.fullmatch(w)]
+    if bad:
+        raise ValueError(f"{len(bad)} invalid word(s) in the word lists, e.g. {bad[:5]}")
+    words   = list(dict.fromkeys(possibles_ + targets_))
+    answers = set(targets_)
+    return words, np.array([w in answers for w in words], dtype=bool)
+
+def compile_word_lists():
+    """Write the binary form of the dictionary for fast startup; returns its path."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    words, is_answer = build_dictionary()
+    path = _dictionary_path()
+    tmp  = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, letters=encode_words(words), is_answer=is_answer)
+    os.replace(tmp, path)
+    return path
+
+
+# ---------- Registry (each loaded once per process) -----------------------
+@functools.lru_cache(maxsize=None)
+def dictionary():
+    """(words, is_answer): the canonical word table, from the compiled form when one is fresh."""
+    compiled = _dictionary_path()
+    if os.path.exists(compiled):
+        with np.load(compiled) as data:
+            words, is_answer = decode_words(data["letters"]), data["is_answer"]
     else:
-        return False
\ No newline at end of file
+        words, is_answer = build_dictionary()
+    is_answer.flags.writeable = False
+    return tuple(words), is_answer
+
+def all_words():
+    """Every word in the dictionary once, the list every solver draws from."""
+    return dictionary()[0]
+
+def answer_mask():
+    """Read-only bool array: answer_mask()[i] is True when all_words()[i] is an answer."""
+    return dictionary()[1]
+
+@functools.lru_cache(maxsize=None)
+def answer_ids():
+    """Indices of the answers in all_words()."""
+    ids = np.flatnonzero(answer_mask())
+    ids.flags.writeable = False
+    return ids
+
+@functools.lru_cache(maxsize=None)
+def possibles():
+    """Dictionary words that are allowed guesses but never answers."""
+    words, is_answer = dictionary()
+    return tuple(w for w, a in zip(words, is_answer) if not a)
+
+@functools.lru_cache(maxsize=None)
+def targets():
+    """The answer words, in dictionary order."""
+    words = all_words()
+    return tuple(words[i] for i in answer_ids())
+
+@functools.lru_cache(maxsize=None)
+def valid_guesses():
+    return frozenset(all_words())
+
+@functools.lru_cache(maxsize=None)
+def word_ids():
+    """Read-only word -> index into all_words()."""
+    return types.MappingProxyType({w: i for i, w in enumerate(all_words())})
+
+@functools.lru_cache(maxsize=None)
+def word_letters():
+    """Read-only (n, 5) uint8 letters of all_words()."""
+    letters = encode_words(all_words())
+    letters.flags.writeable = False
+    return letters
+
+
+if __name__ == "__main__":
+    path = compile_word_lists()
+    words, is_answer = dictionary()
+    print(f"{len(words)} words ({int(is_answer.sum())} answers) -> {os.path.relpath(path, DATA_DIR)}")
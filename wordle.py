@@ -5,9 +5,10 @@ You can manually set the SECRET_WORD to define what the answer should be.
 import string
 from word_lists import get_target
 from word_lists import is_valid_guess
+import word_lists
 from pruning import wordlePrune, infoPrune
 
-SECRET_WORD = get_target()
+SECRET_WORD = None   # set to fix the answer; None picks a random target when a game starts
 
 def initialize_letter_status():
     """
@@ -109,27 +110,22 @@ def categorize_global(letter_status):
 
 
 
-def play_wordle_persistent():
+def play_wordle_persistent(secret_word=None):
     #ChatGPT-o1
+    secret_word = secret_word or SECRET_WORD or get_target()
     print("Welcome to the Wordle Emulator!")
-    # print(f"SECRET_WORD is set to: {SECRET_WORD} (for testing).")
+    # print(f"SECRET_WORD is set to: {secret_word} (for testing).")
     print("Up to 6 attempts.\n")
 
     # Initialize the global letter status dict
     letter_status = initialize_letter_status()
 
     # Initialize the pruning list for pruning.py (can be changed for multiple pruning algorithms)
-    with open('wordle_targets.txt', 'r') as file:
-        targets = file.readlines()
-        targets = [target.strip().upper() for target in targets]
-    with open('wordle_possibles.txt', 'r') as file1:
-        possibles = file1.readlines()
-        possibles = [possible.strip().upper() for possible in possibles]
-    
-
-    # solutions_list = targets.copy()
-    solutions_list = possibles + targets
-    information_list = possibles + targets
+    all_words = list(word_lists.all_words())     # canonical dictionary, every word once
+
+    # solutions_list = list(word_lists.targets())
+    solutions_list = all_words.copy()
+    information_list = all_words.copy()
 
     max_guesses = 6
     for attempt in range(1, max_guesses + 1):
@@ -150,7 +146,7 @@ def play_wordle_persistent():
             guess_in_wrong_place,
             guess_not_in_word,
             guess_colors,
-        ) = wordle_feedback_for_guess(guess, SECRET_WORD)
+        ) = wordle_feedback_for_guess(guess, secret_word)
 
         print(guess_colors)
 
@@ -226,11 +222,11 @@ def play_wordle_persistent():
         print()
 
         # Check if guess is exactly correct
-        if guess == SECRET_WORD:
-            print(f"Congratulations! You guessed '{SECRET_WORD}' in {attempt} tries!")
+        if guess == secret_word:
+            print(f"Congratulations! You guessed '{secret_word}' in {attempt} tries!")
             return
 
-    print(f"Out of attempts! The secret word was '{SECRET_WORD}'.")
+    print(f"Out of attempts! The secret word was '{secret_word}'.")
 
 if __name__ == "__main__":
     play_wordle_persistent()
\ No newline at end of file
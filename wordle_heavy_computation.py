@@ -1,288 +1,540 @@
-import matplotlib.pyplot as plt
+# matplotlib and tqdm are imported where they are used so that importing
+# this module (pool workers, notebooks) stays cheap and does no I/O.
 import random
-from tqdm import tqdm
-import os, pickle
+import contextlib
+import functools
+import os, pickle, sys, time
 import multiprocessing as mp
 import numpy as np
-import string
-from word_lists import get_target
-from word_lists import is_valid_guess
-from pruning import wordlePrune, infoPrune
+import word_lists
+import instrumentation
+from pruning import WordIndex, wordlePruneIndices, infoPruneIndices
+from guesser import Guesser, game_rng
+import guesser_entropy
+import decision_tree
+from shared_words import SharedWordTable
+from game_state import GameState
+from feedback import PATTERN_COLORS, pattern_code, word_list_hash
+from results_store import LEGACY_ENGINE, RESULTS_DB, UNSEEDED, ResultsStore, RunKey
+
+# Solver variants the simulator can play, named "<mode>" or "<mode>-<guesser>".
+# Modes:
+#   normal  - guesses from every word, narrowed by infoPrune to fresh letters
+#   hard    - every guess must be consistent with the feedback so far
+#   answers - solutions and guesses both restricted to the answer list
+# Guessers:
+#   heuristic - guesser.Guesser, the default: a bare mode name means this one
+#   minimax, survivors, entropy, expected, worst_case
+#             - guesser_entropy.Guesser with that scoring mode, over the
+#               feedback matrix; only in normal mode may minimax fall back
+#               to words outside the lists (hard and answers keep their rules)
+#   tree      - decision_tree strategy tree over the answer list, built once
+#               per opener (normal and answers only: a fixed tree has no
+#               hard mode)
+MODES      = ("normal", "hard", "answers")
+GUESSERS   = ("heuristic", "minimax", "survivors", "entropy", "expected", "worst_case", "tree")
+TREE_MODES = ("normal", "answers")
+SOLVERS    = MODES + tuple(f"{mode}-{g}" for g in GUESSERS[1:]
+                           for mode in (TREE_MODES if g == "tree" else MODES))
+
+
+def parse_solver(solver):
+    """"hard-minimax" -> ("hard", "minimax"); a bare mode is the heuristic guesser."""
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}, expected one of {SOLVERS}")
+    mode, _, kind = solver.partition("-")
+    return mode, kind or "heuristic"
+
+
+_SEARCHERS = {}     # (guesser_entropy mode, game mode) -> Guesser, shared by every game in this process
+
+
+def _guesser(kind, mode, rng=None):
+    """The guesser for one game (or one batch) of the given kind in game mode `mode`."""
+    if kind == "heuristic":
+        return Guesser(index=WORD_INDEX, rng=rng)
+    if (kind, mode) not in _SEARCHERS:
+        # over ALL_WORDS, which pool workers take from the shared table; its
+        # survivor cache is keyed on the candidate set, so games can share it
+        _SEARCHERS[kind, mode] = guesser_entropy.Guesser(mode=kind, widen=mode == "normal", words=ALL_WORDS)
+    return _SEARCHERS[kind, mode]
+
+
+@functools.lru_cache(maxsize=8)
+def _tree(opener, mode):
+    """Strategy tree for opener; in answers mode later guesses are answers too."""
+    if mode == "answers":
+        guesses = TARGETS if opener in TARGETS else TARGETS + [opener]
+        return decision_tree.load_or_build_tree(opener, guesses, TARGETS)
+    return decision_tree.load_or_build_tree(opener, ALL_WORDS, TARGETS)
+
+
+def _tree_result(tree, secret):
+    """Guesses the tree needs for secret, 7 when it loses."""
+    played = tree.play(secret)
+    return len(played) if played[-1] == secret else 7
+
+# Every game draws among the guesser's tied choices with its own
+# game_rng(seed, starting word, secret), so a sweep is reproducible and
+# does not depend on which worker, or in which order, a game is played.
+SEED = 0
+
+# Bump whenever a change alters the outcome of simulated games (pruning
+# rules, guesser choices, seeding): stored results are keyed on it, so
+# rows from an older engine are never read back as current.
+ENGINE_VERSION = 1
+
+
+def simulate_wordle_game(starting_word, secret_word, solver="normal", seed=SEED):
+    load_word_lists()
+    mode, kind = parse_solver(solver)
+    if kind == "tree":
+        return _tree_result(_tree(starting_word, mode), secret_word)
+    guesser = _guesser(kind, mode, game_rng(seed, starting_word, secret_word))
+    state   = GameState()
+
+    # Candidate sets are index arrays into WORD_INDEX.words (== ALL_WORDS);
+    # pruning returns new arrays, so every game starts from a shared array
+    solutions_list = ANSWER_IDS if mode == "answers" else ALL_IDX
+    information_list = solutions_list
 
-class Guesser:
-    def make_guess(self, attempt, solutions_list, information_list, letter_status):
+    max_guesses = 6
+    for attempt in range(1, max_guesses + 1):
+        instrumentation.turn = attempt
         if attempt == 1:
-            return "SALET"
-        
-        # If narrowing down to few solutions, prioritize that
-        if len(solutions_list) <= (7 - attempt):
-            return solutions_list[-1]
-
-        guessed_letters = {
-            L for L, status in letter_status.items() if status["state"] != "not_guessed"
-        }
-
-        yellow_letters = {
-            L for L, status in letter_status.items() if status["state"] == "in_wrong_place"
-        }
-
-        def sort_key(word):
-            unique = set(word)
-            unguessed_count = sum(1 for c in unique if c not in guessed_letters)
-            has_yellow = any(c in yellow_letters for c in word)
-            return (-unguessed_count, -has_yellow)
+            guess = starting_word
+        else:
+            guess = guesser.make_guess(attempt, solutions_list, information_list, state, state.history)
 
-        sorted_words = sorted(information_list, key=sort_key)
+        # Get feedback
+        guess_colors = PATTERN_COLORS[pattern_code(guess, secret_word)]
+        state.apply(guess, guess_colors)
 
-        if len(information_list) == 0:
-            return solutions_list[-1]
+        # Update pruning
+        solutions_list = wordlePruneIndices(guess, solutions_list, guess_colors, WORD_INDEX)
+        if mode == "hard":
+            information_list = solutions_list
+        else:
+            information_list = infoPruneIndices(guess, information_list, guess_colors, WORD_INDEX)
 
-        top_choices = sorted_words[:5] if len(sorted_words) >= 5 else sorted_words
-        return random.choice(top_choices)
+        if guess == secret_word:
+            return attempt  # return number of guesses
 
-SECRET_WORD = get_target()
-guesser = Guesser()
+    return 7  # 7 means failure (loss)
 
-def initialize_letter_status():
+def simulate_batch(starting_word, secrets=None, solver="normal", seed=SEED):
     """
-    Creates a dict of all letters
+    Play starting_word against every secret (default: TARGETS) in lockstep
+    and return an int8 array of guesses used per secret (7 = lost), the
+    same numbers simulate_wordle_game gives game by game.
+
+    Games that have seen the same guesses and feedback share one state, so
+    the guesser's choices are worked out once per distinct state instead of
+    once per game. Each game still draws its own guess from those choices
+    with its own game_rng, exactly as Guesser.make_guess does, before the
+    group is split again by guess and feedback.
     """
-    # ─── initialization ───────────────────────────────────────────────
-    return {
-        ch: {"state": "not_guessed",
-            "green": set(),           # positions confirmed green
-            "yellow": set()}          # positions where it is NOT allowed
-        for ch in string.ascii_uppercase
-    }
-
+    load_word_lists()
+    mode, kind = parse_solver(solver)
+    secrets = TARGETS if secrets is None else list(secrets)
+    if kind == "tree":                          # the tree already fixes every game
+        tree = _tree(starting_word, mode)
+        return np.array([_tree_result(tree, s) for s in secrets], dtype=np.int8)
+    guesser = _guesser(kind, mode)
+    result  = np.full(len(secrets), 7, dtype=np.int8)
+    rngs    = {}                                              # game -> game_rng, made on its first draw
+
+    start  = ANSWER_IDS if mode == "answers" else ALL_IDX
+    groups = [(GameState(), start, start, range(len(secrets)))]   # (state, solutions, information, games)
 
+    max_guesses = 6
+    for attempt in range(1, max_guesses + 1):
+        instrumentation.turn = attempt
+        next_groups = []
+        for state, solutions_list, information_list, games in groups:
+            if attempt == 1:
+                choices = [starting_word]
+            else:
+                choices = guesser.choices(attempt, solutions_list, information_list, state)
+
+            by_guess = {}
+            for g in games:
+                if len(choices) == 1:
+                    guess = choices[0]
+                else:
+                    rng = rngs.get(g)
+                    if rng is None:
+                        rng = rngs[g] = game_rng(seed, starting_word, secrets[g])
+                    guess = rng.choice(choices)
+                by_guess.setdefault(guess, []).append(g)
+
+            for guess, members in by_guess.items():
+                by_colors = {}
+                for g in members:
+                    if guess == secrets[g]:
+                        result[g] = attempt
+                    else:
+                        by_colors.setdefault(PATTERN_COLORS[pattern_code(guess, secrets[g])], []).append(g)
+
+                for guess_colors, ids in by_colors.items():
+                    branch = state.copy()
+                    branch.apply(guess, guess_colors)
+                    sols = wordlePruneIndices(guess, solutions_list, guess_colors, WORD_INDEX)
+                    if mode == "hard":
+                        info = sols
+                    else:
+                        info = infoPruneIndices(guess, information_list, guess_colors, WORD_INDEX)
+                    next_groups.append((branch, sols, info, ids))
+        groups = next_groups
+    return result
 
-def wordle_feedback_for_guess(guess: str, solution: str):
+# ---------- 1.  Load word lists ONCE -----------------------------------
+# Loaded on first use by load_word_lists(); pool workers get the same lists
+# from a SharedWordTable in _attach_worker() instead of re-reading them, and
+# their WORD_INDEX is a view of the parent's arrays in that table.
+# ALL_WORDS is word_lists' canonical dictionary: every word exactly once.
+POSSIBLES = TARGETS = ALL_WORDS = STARTING_WORDS = TARGETS_ARR = None
+WORD_INDEX = ALL_IDX = ANSWER_IDS = None
+T = 0
+_SHARED = None
+
+
+def _set_word_lists(all_words, answer_ids, index=None):
+    global POSSIBLES, TARGETS, ALL_WORDS, STARTING_WORDS, TARGETS_ARR, T, WORD_INDEX, ALL_IDX, ANSWER_IDS
+    ALL_WORDS      = all_words                            # 13 k-ish, stays in RAM
+    ANSWER_IDS     = np.asarray(answer_ids)               # rows of ALL_WORDS that are answers
+    TARGETS        = [ALL_WORDS[i] for i in ANSWER_IDS]
+    is_answer      = np.zeros(len(ALL_WORDS), dtype=bool)
+    is_answer[ANSWER_IDS] = True
+    POSSIBLES      = [w for w, a in zip(ALL_WORDS, is_answer) if not a]   # guess-only words
+    STARTING_WORDS = ALL_WORDS
+    TARGETS_ARR    = np.array(TARGETS)                    # NumPy view if you need it
+    T              = len(TARGETS)                         # games per start word
+    WORD_INDEX     = index if index is not None else WordIndex(ALL_WORDS)   # letters / masks / counts per word
+    ALL_IDX        = WORD_INDEX.all()                     # every word, as indices
+
+
+def _attach_worker(shm_name, n_words, answer_ids, instrument=False, profile_dir=None):
+    """Pool initializer: take the word lists from the parent's shared table."""
+    global _SHARED
+    _SHARED = SharedWordTable.attach(shm_name, n_words)
+    words   = _SHARED.words()
+    _set_word_lists(words, answer_ids, _SHARED.word_index(words))
+    if instrument:
+        instrumentation.enable()
+    if profile_dir:
+        instrumentation.profile(profile_dir)
+
+
+def load_word_lists():
+    """Populate ALL_WORDS / TARGETS / POSSIBLES … from the registry if not set yet."""
+    if ALL_WORDS is None:
+        _set_word_lists(list(word_lists.all_words()), word_lists.answer_ids())
+
+
+def list_hash():
+    """Hash of the current word lists (feedback.word_list_hash)."""
+    load_word_lists()
+    return word_list_hash(ALL_WORDS, TARGETS)
+
+
+def run_key(seed=SEED):
+    """Results-store key of runs with the current word lists, engine and seed."""
+    return RunKey(list_hash(), ENGINE_VERSION, seed)
+
+
+def legacy_key():
+    """Results-store key of the runs imported from results.pkl (unversioned engine, unseeded)."""
+    return RunKey(list_hash(), LEGACY_ENGINE, UNSEEDED)
+
+
+# ---------- 2.  Per-opener worker ---------------------------------------
+def worker(task: tuple[str, str, int]) -> tuple[str, str, np.ndarray, dict | None]:
     """
-    Evaluate one Wordle guess.
-
-    Returns
-    -------
-    in_right_place : list[(idx, letter)]
-    in_wrong_place : list[(idx, letter)]
-    not_in_word    : list[letter]               # sorted, no dups
-    guess_colors   : str                        # e.g. "GGBYB"
-        For each index i:
-            G → green  (correct letter, correct spot)
-            Y → yellow (correct letter, wrong spot)
-            B → black/gray (letter not in word)
-    written with assistance of ChatGPT-o3
+    Run one (starting word, solver, seed) against every target, return
+    counts[7] and this worker's instrumentation table (None unless instrumented).
     """
-    guess = guess.upper()
-    solution = solution.upper()
-    colors = ["B"] * 5                # default everything to gray/black
-    sol_chars = list(solution)
-    used      = [False] * 5           # which letters of solution already matched
-
-
-    in_right_place = []
-    in_wrong_place = []
-    not_in_word_set = set()
-
-    # Track used letters in solution to avoid reusing them
-    used = [False] * 5
-
-    # Pass 1 – exact matches → GREEN
-    for i in range(5):
-        if guess[i] == sol_chars[i]:
-            colors[i] = "G"
-            in_right_place.append((i, guess[i]))
-            used[i] = True
-
-    # Pass 2 – wrong‑place matches → YELLOW or still B
-    for i in range(5):
-        if colors[i] == "G":
-            continue                  # already handled
-        found = False
-        for j in range(5):
-            if not used[j] and guess[i] == sol_chars[j]:
-                # letter exists elsewhere and not consumed yet
-                colors[i] = "Y"
-                in_wrong_place.append((i, guess[i]))
-                used[j] = True
-                found = True
-                break
-        if not found:
-            not_in_word_set.add(guess[i])
-
-    return (
-        in_right_place,
-        in_wrong_place,
-        sorted(not_in_word_set),
-        "".join(colors),
-    )
-
-
-def categorize_global(letter_status):
-    greens, yellows, grays, untried = [], [], [], []
-
-    for L, entry in letter_status.items():
-        st    = entry["state"]
-        green = sorted(entry["green"])
-        yel   = sorted(entry["yellow"])
-
-        if st == "in_right_place":
-            greens.append((L, green))      # list indices that ARE green
-        elif st == "in_wrong_place":
-            yellows.append((L, yel))       # list indices that CANNOT be yellow
-        elif st == "not_in_word":
-            grays.append(L)
-        else:
-            untried.append(L)
-
-    greens.sort(key=lambda t: t[0])
-    yellows.sort(key=lambda t: t[0])
-    grays.sort()
-    untried.sort()
-    return greens, yellows, grays, untried
+    load_word_lists()
+    word, solver, seed = task
+    with instrumentation.task():
+        # all targets advance together; each shared state is searched only once
+        played = simulate_batch(word, TARGETS, solver, seed)
+    counts = np.bincount(played - 1, minlength=7).astype(np.int32)
+    return word, solver, counts, instrumentation.drain()
 
-with open("wordle_possibles.txt") as f:
-    POSSIBLES = [w.strip().upper() for w in f]
-with open("wordle_targets.txt") as f:
-    TARGETS = [w.strip().upper() for w in f]
 
-ALL_WORDS = POSSIBLES + TARGETS          # 25 k-ish, stays in RAM
-T        = len(TARGETS)                  # games per starting word
-
-def simulate_wordle_game(starting_word, secret_word):
-    guesser = Guesser()
-    letter_status = initialize_letter_status()
-
-    # Fresh copies for this one game
-    solutions_list = ALL_WORDS.copy()
-    information_list = ALL_WORDS.copy()
+# ---------- 3.  Multiprocessing driver ---------------------------------
+# append-only, one run per line:
+#   "WORD<TAB>c1 … c7<TAB>SOLVER<TAB>LIST_HASH<TAB>ENGINE<TAB>SEED"
+CHECKPOINT = "sweep_checkpoint.tsv"
 
-    max_guesses = 6
-    for attempt in range(1, max_guesses + 1):
-        if attempt == 1:
-            guess = starting_word
-        else:
-            guess = guesser.make_guess(attempt, solutions_list, information_list, letter_status)
 
-        # Get feedback
-        (
-            guess_in_right_place,
-            guess_in_wrong_place,
-            guess_not_in_word,
-            guess_colors,
-        ) = wordle_feedback_for_guess(guess, secret_word)
+def checkpoint_line(word, solver, key, counts):
+    return "\t".join([word, " ".join(str(int(c)) for c in counts), solver, key.list_hash,
+                      str(key.engine), str(key.seed)]) + "\n"
 
-        # Update pruning
-        solutions_list = wordlePrune(guess, solutions_list, guess_colors)
-        information_list = infoPrune(guess, information_list, guess_colors)
-
-        # Update letter_status
-        for idx, L in guess_in_right_place:
-            letter_status[L]["state"] = "in_right_place"
-            letter_status[L]["green"].add(idx)
-        for idx, L in guess_in_wrong_place:
-            letter_status[L]["yellow"].add(idx)
-            if letter_status[L]["state"] != "in_right_place":
-                letter_status[L]["state"] = "in_wrong_place"
-        for L in guess_not_in_word:
-            if letter_status[L]["state"] == "not_guessed":
-                letter_status[L]["state"] = "not_in_word"
 
-        if guess == secret_word:
-            return attempt  # return number of guesses
+def load_checkpoint(path=CHECKPOINT, key=None):
+    """
+    {solver: {word: counts[7]}} for every complete line of the checkpoint
+    file run under `key` (default: run_key()). Lines from other word lists,
+    engines or seeds, and lines in the older formats without a key, are
+    skipped.
+    """
+    key  = key or run_key()
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 12 or not line.endswith("\n"):
+                continue                      # torn last line from a crash, or an old format
+            word, counts, (solver, lists, engine, seed) = parts[0], parts[1:8], parts[8:]
+            if (lists, engine, seed) != (key.list_hash, str(key.engine), str(key.seed)):
+                continue
+            done.setdefault(solver, {})[word] = np.array([int(c) for c in counts], dtype=np.int32)
+    return done
+
+
+@contextlib.contextmanager
+def _worker_pool(processes=None, instrument=False, profile_dir=None):
+    """
+    Process pool whose workers take the word lists from a SharedWordTable
+    of this process's (see _attach_worker); the table is freed on exit.
+    """
+    load_word_lists()
+    table = SharedWordTable.create(ALL_WORDS, WORD_INDEX)
+    try:
+        with mp.Pool(processes or mp.cpu_count(), initializer=_attach_worker,
+                     initargs=(table.name, len(table), ANSWER_IDS, instrument, profile_dir)) as pool:
+            yield pool
+    finally:
+        table.close()
+        table.unlink()
+
+
+def run_sweep(words, checkpoint=CHECKPOINT, processes=None, solvers=("normal",), store=None,
+              instrument=False, profile_dir=None, seed=SEED):
+    """
+    Run worker() for every (word, solver) pair in one process pool and
+    return {solver: {word: counts}}. Runs are seeded (see SEED), so the
+    same seed gives the same counts however the pool schedules them.
+
+    Each finished pair is appended to `checkpoint` and flushed straight away,
+    so an interrupted sweep restarted with the same checkpoint only runs the
+    pairs that are still missing. Lines carry the run_key (word lists,
+    engine, seed); lines from any other run are ignored. With a ResultsStore, every pair is also
+    upserted into it as it finishes.
+
+    instrument=True times every stage in the workers and prints the merged
+    per-stage / per-turn table at the end; profile_dir additionally keeps a
+    cProfile per worker there and merges them into profile_dir/sweep.prof.
+    """
+    from tqdm import tqdm
+
+    load_word_lists()
+    for solver in solvers:
+        if solver not in SOLVERS:
+            raise ValueError(f"unknown solver {solver!r}, expected one of {SOLVERS}")
+    key     = run_key(seed)
+    done    = load_checkpoint(checkpoint, key)
+    results = {solver: done.get(solver, {}) for solver in solvers}
+    if store is not None:                      # runs finished before the store was used
+        store.upsert_many((w, s, key, c) for s in solvers for w, c in results[s].items())
+    todo    = [(w, s, seed) for s in solvers for w in dict.fromkeys(words) if w not in results[s]]
+    print(f"{sum(map(len, results.values()))} runs already in {checkpoint}, {len(todo)} to go")
+    if not todo:
+        return results
+    instrumentation.reset()
+    if profile_dir:
+        instrumentation.clear_profiles(profile_dir)
+
+    if os.path.exists(checkpoint) and os.path.getsize(checkpoint):
+        with open(checkpoint, "rb+") as f:       # finish a torn last line first
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    start = time.perf_counter()
+    with _worker_pool(processes, instrument, profile_dir) as pool, open(checkpoint, "a") as out:
+        iterable = pool.imap_unordered(worker, todo, chunksize=1)
+        bar = tqdm(iterable, total=len(todo), desc="Simulating", unit="run")
+        for done, (word, solver, counts, stats) in enumerate(bar, 1):
+            instrumentation.merge(stats)
+            out.write(checkpoint_line(word, solver, key, counts))
+            out.flush()
+            results[solver][word] = counts
+            if store is not None:
+                store.upsert(word, solver, key, counts)
+            bar.set_postfix(games_per_s=f"{done * T / (time.perf_counter() - start):.0f}")
+
+    if instrument:
+        print(instrumentation.summary())
+    if profile_dir:
+        print(f"profile written to {instrumentation.merge_profiles(profile_dir)}")
+    return results
+
+
+# ---------- 3b. Successive halving -------------------------------------
+# Instead of playing every opener against every target, play the openers
+# that are still in the running against a growing, stratified sample of
+# the targets and drop those that are clearly worse than the current top k.
+# Every game is seeded by (seed, opener, secret), so the games an opener
+# plays in one round are the same games a full sweep would play, and the
+# survivors' final counts equal a full sweep's exactly.
+
+GUESS_VALUES = np.arange(1, 8)          # guesses per counts[7] bin, a loss counted as 7
+
+
+def stratified_targets(seed=SEED):
+    """
+    Indices into TARGETS ordered so that every prefix is a stratified sample
+    (by first letter): each letter's targets are shuffled and spread evenly
+    over the whole order.
+    """
+    load_word_lists()
+    rng    = random.Random(f"{seed}:targets")
+    strata = {}
+    for i, w in enumerate(TARGETS):
+        strata.setdefault(w[0], []).append(i)
+    keyed = []
+    for members in strata.values():
+        rng.shuffle(members)
+        keyed.extend(((j + rng.random()) / len(members), i) for j, i in enumerate(members))
+    return np.array([i for _, i in sorted(keyed)])
 
-    return 7  # 7 means failure (loss)
 
-# ---------- 1.  Load word lists ONCE -----------------------------------
-with open("wordle_possibles.txt") as f:
-    POSSIBLES = [w.strip().upper() for w in f]
+def subset_worker(task: tuple[int, str, str, int, np.ndarray]) -> tuple[int, np.ndarray]:
+    """Run one (row, starting word, solver, seed) against TARGETS[ids]; guesses per game."""
+    load_word_lists()
+    row, word, solver, seed, ids = task
+    return row, simulate_batch(word, [TARGETS[i] for i in ids], solver, seed)
 
-with open("wordle_targets.txt") as f:
-    TARGETS = [w.strip().upper() for w in f]          # <-- name now matches worker
 
-STARTING_WORDS = POSSIBLES + TARGETS
-TARGETS_ARR    = np.array(TARGETS)                    # NumPy view if you need it
-T              = len(TARGETS)                         # games per start word
+def mean_guesses(counts):
+    """Guesses per game, a loss counted as 7 (ResultsStore ranking "guesses")."""
+    return float(counts @ GUESS_VALUES) / counts.sum()
 
 
-# ---------- 2.  Your fast simulate function must be defined *above*
-#               (here we assume you already replaced the I/O-heavy version)
-# def simulate_wordle_game_fast(...): ...
+def loss_rate(counts):
+    """Share of games lost (ResultsStore ranking "loss")."""
+    return float(counts[6]) / counts.sum()
 
 
-def worker(word: str) -> tuple[str, np.ndarray]:
-    """Run one starting word against every target, return counts[7]."""
-    counts = np.zeros(7, dtype=np.int32)
-    sim    = simulate_wordle_game                # local ref → tiny speed-up
-    for secret in TARGETS:                            # targets in RAM
-        counts[sim(word, secret) - 1] += 1
-    return word, counts
+# ResultsStore rankings run_halving can rank by: (score of full counts[7],
+# per-game cost whose mean over the same games is that score)
+HALVING_RANKINGS = {
+    "loss":    (loss_rate,    lambda played: (played == 7).astype(np.int8)),
+    "guesses": (mean_guesses, lambda played: played),
+}
 
 
-# ---------- 3.  Multiprocessing driver ---------------------------------
-if __name__ == "__main__":
+def _still_in_running(rows, played, n, k, z, by="loss"):
+    """
+    The rows of `played` (guesses per game, first n targets filled in) that
+    are not clearly worse than every one of the current k best by `by`.
+    Openers are compared game by game on the same targets, which cancels
+    out how hard each target is; "clearly" means the mean difference in
+    per-game cost is more than z standard errors above zero. The finite
+    population correction shrinks the bound to nothing at n == T.
+    """
+    if len(rows) <= k:
+        return rows
+    games = HALVING_RANKINGS[by][1](played[rows, :n])
+    fpc   = np.sqrt((T - n) / (T - 1))
+    worse = np.ones(len(rows), dtype=bool)
+    for best in np.argsort(games.mean(axis=1), kind="stable")[:k]:
+        diff   = games - games[best]                             # int8: |diff| <= 6
+        mean   = diff.mean(axis=1)
+        spread = diff.std(axis=1, ddof=1)
+        worse &= mean - z * spread / np.sqrt(n) * fpc > 0
+    return rows[~worse]
+
+
+def run_halving(words, k=10, processes=None, solver="normal", store=None, seed=SEED,
+                first=128, growth=2, z=3.0, by="loss"):
+    """
+    Rank openers by the ResultsStore ranking `by` ("loss" or "guesses", see
+    HALVING_RANKINGS) without a full sweep, and return the best k as
+    [(word, score, counts[7]), …], ordered like ResultsStore.top.
+
+    Round r plays every opener still in the running on the next slice of
+    stratified_targets(seed), so after it each has played the first
+    first * growth**r targets; openers that are clearly worse than each of
+    the current top k are dropped (see _still_in_running). The last round
+    reaches every target, so the survivors are ranked on full counts, and
+    those (only) are upserted into `store`.
+    """
+    from tqdm import tqdm
+
+    load_word_lists()
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}, expected one of {SOLVERS}")
+    if by not in HALVING_RANKINGS:
+        raise ValueError(f"unknown ranking {by!r}, expected one of {tuple(HALVING_RANKINGS)}")
+    order  = stratified_targets(seed)
+    words  = list(dict.fromkeys(words))
+    played = np.zeros((len(words), T), dtype=np.int8)           # guesses per game, in `order`
+    alive  = np.arange(len(words))
+    games  = n = 0
+    size   = first
+
+    with _worker_pool(processes) as pool:
+        while n < T:
+            ids   = order[n:min(size, T)]
+            tasks = [(r, words[r], solver, seed, ids) for r in alive]
+            for r, guesses in tqdm(pool.imap_unordered(subset_worker, tasks, chunksize=1),
+                                   total=len(tasks), desc=f"{n + len(ids)}/{T} targets", unit="run"):
+                played[r, n:n + len(ids)] = guesses
+            games += len(alive) * len(ids)
+            n     += len(ids)
+            size  *= growth
+            if n < T:
+                alive = _still_in_running(alive, played, n, k, z, by)
+
+    counts = {words[r]: np.bincount(played[r] - 1, minlength=7).astype(np.int32) for r in alive}
+    if store is not None:
+        store.upsert_many((w, solver, run_key(seed), c) for w, c in counts.items())
+    score  = {w: HALVING_RANKINGS[by][0](c) for w, c in counts.items()}
+    ranked = sorted(counts, key=lambda w: (score[w], w))
+    print(f"{len(words)} openers, {len(counts)} fully evaluated, "
+          f"{games / (len(words) * T):.1%} of a full sweep's games")
+    return [(w, score[w], counts[w]) for w in ranked[:k]]
+
+
+# ---------- 4.  Post-processing ------------------------------------
+LABELS = ["1 guess", "2 guesses", "3 guesses",
+          "4 guesses", "5 guesses", "6 guesses", "lost"]
+
+
+def plot_top_words(store, n=10, solver="normal", suffix="", key=None, top=None):
+    """
+    Bar chart PNG of the guess distribution for the n lowest-loss words in
+    the store, among runs under `key` (default: run_key()), or for the
+    [(word, score, counts[7]), …] in `top` when given. Returns the words
+    plotted; none (with a warning) when the store has no such runs.
+    """
+    import matplotlib.pyplot as plt
 
-    # # --- Windows needs 'spawn' & freeze_support() in some IDEs ---------
-    # mp.freeze_support()
-
-    # cpu_cnt = mp.cpu_count()
-    # with mp.Pool(cpu_cnt) as pool:
-    #     results_list = []
-
-    #     iterable = pool.imap_unordered(
-    #         worker,
-    #         STARTING_WORDS,
-    #         chunksize=64,            # 64 words at a time
-    #         # chunksize=1,          # for debugging
-    #     )
-
-    #     # --- progress bar or simple counter --------------------------------
-    #     if tqdm is not None:                                   # pretty bar
-    #         for result in tqdm(iterable,
-    #                         total=len(STARTING_WORDS),
-    #                         desc="Simulating",
-    #                         unit="word"):
-    #             results_list.append(result)
-    #     else:                                                  # fallback
-    #         done = 0
-    #         for result in iterable:
-    #             results_list.append(result)
-    #             done += 1
-    #             if done % 500 == 0 or done == len(STARTING_WORDS):
-    #                 left = len(STARTING_WORDS) - done
-    #                 print(f"{done}/{len(STARTING_WORDS)} done "
-    #                     f"({left} left)")
-
-    # # ---------- 4.  Post-processing ------------------------------------
-    # results  = {w: c                for w, c in results_list}
-
-
-    
-    with open("results.pkl", "rb") as f:
-        results = pickle.load(f)
-
-    loss_pct = {w: (c[6] / T) * 100 for w, c in results.items()}
     # --- choose the 10 best words -----------------------------------------------
-    top10_words = sorted(loss_pct, key=loss_pct.get)[:10]
-
-    labels = ["1 guess", "2 guesses", "3 guesses",
-            "4 guesses", "5 guesses", "6 guesses", "lost"]
-
-    with open("results.pkl", "wb") as f:
-        pickle.dump(results, f)
-
-    for w in top10_words:
-        counts = results[w]                         # ← fixed
-        percentages = [c / T * 100 for c in counts]
+    key = key or run_key()
+    if top is None:
+        top = store.top(key, n, "loss", solver)
+    if not top:
+        print(f"warning: no {solver} runs under {key} in the store, nothing plotted", file=sys.stderr)
+    for w, _, counts in top:
+        games = counts.sum()
+        percentages = [c / games * 100 for c in counts]
 
         fig, ax = plt.subplots(figsize=(8, 5))
-        bars = ax.bar(labels, percentages, color="skyblue")
+        bars = ax.bar(LABELS, percentages, color="skyblue")
 
         ax.set_title(f"Wordle results for starting word: {w}")
         ax.set_ylabel("Percentage of games (%)")
         ax.set_ylim(0, 100)
-        ax.set_xticks(range(len(labels)))
-        ax.set_xticklabels(labels, rotation=45)
+        ax.set_xticks(range(len(LABELS)))
+        ax.set_xticklabels(LABELS, rotation=45)
 
         for bar, pct in zip(bars, percentages):
             ax.text(bar.get_x() + bar.get_width() / 2,
@@ -290,14 +542,96 @@ if __name__ == "__main__":
                     f"{pct:.1f}%", ha="center", va="bottom")
 
         plt.tight_layout()
-        fig.savefig(f"{w}_results.png", dpi=300)
+        fig.savefig(f"{w}{suffix}_results.png", dpi=300)
         plt.close(fig)
+    return [w for w, _, _ in top]
 
-    # ---------- 5.  Loss table (all words) -----------------------------
-    with open("loss_percentages.txt", "w") as out:
+
+# ---------- 5.  Loss table (all words) -----------------------------
+def write_loss_table(store, path="loss_percentages.txt", solver="normal", key=None):
+    """
+    Write every word's loss rate under `key` (default: run_key()) to path,
+    best first. Returns False, leaving path untouched, when the store has
+    no such runs.
+    """
+    key  = key or run_key()
+    rows = store.top(key, None, "loss", solver)
+    if not rows:
+        print(f"warning: no {solver} runs under {key} in the store, {path} left as is", file=sys.stderr)
+        return False
+    engine = "legacy, unversioned" if key.engine == LEGACY_ENGINE else key.engine
+    seed   = "unseeded" if key.seed == UNSEEDED else key.seed
+    with open(path, "w") as out:
         out.write("Loss percentage for every starting word\n")
-        for word, pct in sorted(loss_pct.items(), key=lambda x: x[1]):
-            out.write(f"{word}: {pct:.2f}%\n")
+        out.write(f"(solver {solver}, engine {engine}, seed {seed}, word lists {key.list_hash})\n")
+        for word, loss, _ in rows:
+            out.write(f"{word}: {loss * 100:.2f}%\n")
+    return True
+
 
-    print("✓ Plots saved to ./wordle_plots/")
-    print("✓ Loss percentages written to loss_percentages.txt")
\ No newline at end of file
+if __name__ == "__main__":
+    # --- Windows needs 'spawn' & freeze_support() in some IDEs ---------
+    mp.freeze_support()
+    load_word_lists()
+
+    # "--solvers=normal,hard,normal-minimax" sweeps several solver variants
+    # (see SOLVERS) at once; anything but "normal" gets its own _<solver>
+    # suffixed output files
+    solvers = ("normal",)
+    for arg in sys.argv[1:]:
+        if arg.startswith("--solvers="):
+            solvers = tuple(arg.split("=", 1)[1].split(","))
+
+    # "--instrument" prints per-stage / per-turn timings after the sweep and
+    # "--profile=DIR" keeps a merged cProfile of the workers in DIR/sweep.prof
+    instrument  = "--instrument" in sys.argv[1:]
+    profile_dir = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--profile=")), None)
+
+    # "--seed=N" plays (and plots, and checkpoints) the sweep with another seed
+    seed = next((int(a.split("=", 1)[1]) for a in sys.argv[1:] if a.startswith("--seed=")), SEED)
+
+    # "--legacy" re-plots and re-tabulates the runs imported with
+    # "--import-pkl" (see legacy_key) instead of current-engine runs; it
+    # never simulates, since new games are always played on this engine
+    legacy = "--legacy" in sys.argv[1:]
+    key    = legacy_key() if legacy else run_key(seed)
+
+    with ResultsStore(RESULTS_DB) as store:
+        # "--import-pkl" loads an old results.pkl ({word: counts}) as "normal"
+        # runs of the legacy engine: they came from the unseeded solver on the
+        # old word lists and pruning rules, so they never rank with new runs
+        if "--import-pkl" in sys.argv[1:]:
+            with open("results.pkl", "rb") as f:
+                store.upsert_many((w, "normal", legacy_key(), c) for w, c in pickle.load(f).items())
+
+        # "--halving=K" only plays every target for the openers that might
+        # make the top K (see run_halving), ranked by loss rate like the
+        # plots and tables, or by mean guesses with "--by=guesses"; the store
+        # then holds full counts for those survivors only, so just the top K
+        # is plotted and no all-words loss table is written
+        halving = next((int(a.split("=", 1)[1]) for a in sys.argv[1:] if a.startswith("--halving=")), None)
+        by      = next((a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--by=")), "loss")
+
+        # "--plot-only" re-plots what is already in the store without simulating
+        halved = {}
+        if "--plot-only" not in sys.argv[1:] and not legacy:
+            if halving:
+                for solver in solvers:
+                    halved[solver] = run_halving(STARTING_WORDS, halving, solver=solver, store=store,
+                                                 seed=seed, by=by)
+                    for w, score, _ in halved[solver]:
+                        print(f"{solver:8} {w}: " + (f"{score * 100:.2f}% lost" if by == "loss"
+                                                     else f"{score:.4f} guesses"))
+            else:
+                run_sweep(STARTING_WORDS, solvers=solvers, store=store,
+                          instrument=instrument, profile_dir=profile_dir, seed=seed)
+
+        for solver in solvers:
+            suffix = "" if solver == "normal" else "_" + solver
+            if plot_top_words(store, solver=solver, suffix=suffix, key=key, top=halved.get(solver)):
+                print(f"✓ Plots saved to ./wordle_plots/ ({solver})")
+            if solver in halved:
+                print(f"  (halving evaluated only the top {halving}; loss_percentages{suffix}.txt left as is)")
+                continue
+            if write_loss_table(store, f"loss_percentages{suffix}.txt", solver, key):
+                print(f"✓ Loss percentages written to loss_percentages{suffix}.txt")